@@ -57,6 +57,9 @@ setup(
     python_requires=">=3.6",
     data_files=[("", ["LICENSE.md"])],
     install_requires=["ormar", "sqlalchemy>=1.3.18,<=1.3.23"],
+    entry_points={
+        "console_scripts": ["sqlalchemy-to-ormar-diff=sqlalchemy_to_ormar.diff:main"]
+    },
     classifiers=[
         "Development Status :: 4 - Beta",
         "Environment :: Web Environment",
@@ -1,5 +1,29 @@
-from .main import ormar_model_str_repr, sqlalchemy_to_ormar
+from .diff import diff_schemas, ormar_model_spec, schema_spec
+from .main import (
+    ormar_model_str_repr,
+    ormar_models_module_str_repr,
+    ormar_models_package_str_repr,
+    sqlalchemy_base_to_ormar,
+    sqlalchemy_to_ormar,
+)
+from .rows import ormar_model_to_row_type, ormar_row_type_str_repr, records_to_rows
+from .memory import conversion_memory_report
+from .startup import prepare
 
 __version__ = "0.0.2"
 
-__all__ = ["sqlalchemy_to_ormar", "ormar_model_str_repr"]
+__all__ = [
+    "sqlalchemy_to_ormar",
+    "sqlalchemy_base_to_ormar",
+    "ormar_model_str_repr",
+    "ormar_models_module_str_repr",
+    "ormar_models_package_str_repr",
+    "ormar_model_to_row_type",
+    "ormar_row_type_str_repr",
+    "records_to_rows",
+    "prepare",
+    "conversion_memory_report",
+    "ormar_model_spec",
+    "schema_spec",
+    "diff_schemas",
+]
@@ -0,0 +1,193 @@
+import argparse
+import contextlib
+import hashlib
+import importlib
+import json
+import os
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Type, cast
+
+import ormar
+from databases import Database
+from ormar import ForeignKeyField, Model
+from sqlalchemy import MetaData
+
+from sqlalchemy_to_ormar.main import _value_str_repr, sqlalchemy_base_to_ormar
+from sqlalchemy_to_ormar.maps import COMMON_PARAMETERS, TYPE_SPECIFIC_PARAMETERS
+
+SPEC_VERSION = 1
+
+
+def _json_value(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return _value_str_repr(value) or getattr(value, "__qualname__", repr(value))
+
+
+def _signature(spec: Any) -> str:
+    dumped = json.dumps(spec, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(dumped.encode()).hexdigest()[:16]
+
+
+def _field_spec(field: Any) -> Dict[str, Any]:
+    field_type = field.__class__.__name__
+    spec: Dict[str, Any] = {"type": field_type}
+    remap_params = {"default": "ormar_default", "name": "db_alias"}
+    for param in COMMON_PARAMETERS.keys():
+        spec[param] = _json_value(getattr(field, remap_params.get(param, param), None))
+    for param in TYPE_SPECIFIC_PARAMETERS.get(field_type.lower(), {}).keys():
+        spec[param] = _json_value(getattr(field, param, None))
+    if field.is_relation:
+        field = cast(ForeignKeyField, field)
+        spec["to"] = field.to.get_name(lower=False)
+        spec["related_name"] = field.related_name
+        if field.is_multi:
+            spec["through"] = field.through.get_name(lower=False)
+        else:
+            spec["onupdate"] = field.onupdate
+            spec["ondelete"] = field.ondelete
+    return spec
+
+
+def ormar_model_spec(model: Type[Model]) -> Dict[str, Any]:
+    """
+    Returns json serializable specification of ormar model,
+    with signatures (hashes) of the whole model and each field.
+    """
+    fields: Dict[str, Dict] = {}
+    relations: Dict[str, Dict] = {}
+    for name, field in model.Meta.model_fields.items():
+        if field.is_relation and field.virtual:
+            continue
+        spec = _field_spec(field)
+        target = relations if field.is_relation else fields
+        target[name] = {"signature": _signature(spec), "spec": spec}
+    constraints = sorted(
+        list(const._pending_colargs)  # type: ignore
+        for const in model.Meta.constraints
+        if isinstance(const, ormar.UniqueColumns)
+    )
+    model_spec = {
+        "tablename": model.Meta.tablename,
+        "fields": fields,
+        "relations": relations,
+        "constraints": constraints,
+    }
+    model_spec["signature"] = _signature(model_spec)
+    return model_spec
+
+
+def schema_spec(models: Iterable[Type[Model]]) -> Dict[str, Any]:
+    """
+    Returns json serializable specification of all passed ormar models.
+    """
+    return {
+        "version": SPEC_VERSION,
+        "models": {
+            model.get_name(lower=False): ormar_model_spec(model) for model in models
+        },
+    }
+
+
+def _changed_names(old: Dict, new: Dict) -> List[str]:
+    return sorted(
+        name
+        for name in old.keys() & new.keys()
+        if old[name]["signature"] != new[name]["signature"]
+    )
+
+
+def _diff_members(old: Dict, new: Dict) -> Dict[str, Any]:
+    return {
+        "added": sorted(new.keys() - old.keys()),
+        "removed": sorted(old.keys() - new.keys()),
+        "changed": {
+            name: {"old": old[name]["spec"], "new": new[name]["spec"]}
+            for name in _changed_names(old, new)
+        },
+    }
+
+
+def _diff_model(old: Dict, new: Dict) -> Dict[str, Any]:
+    old_constraints = {tuple(x) for x in old["constraints"]}
+    new_constraints = {tuple(x) for x in new["constraints"]}
+    model_diff: Dict[str, Any] = {
+        "fields": _diff_members(old["fields"], new["fields"]),
+        "relations": _diff_members(old["relations"], new["relations"]),
+        "constraints": {
+            "added": sorted(list(x) for x in new_constraints - old_constraints),
+            "removed": sorted(list(x) for x in old_constraints - new_constraints),
+        },
+    }
+    if old["tablename"] != new["tablename"]:
+        model_diff["tablename"] = {"old": old["tablename"], "new": new["tablename"]}
+    return model_diff
+
+
+def diff_schemas(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compares two specs returned by `schema_spec`.
+
+    Only models with different signatures are compared field by field.
+    Returns added and removed model names and diff of each changed model,
+    with old and new spec of each changed field and relation.
+    """
+    old_models, new_models = old["models"], new["models"]
+    return {
+        "added": sorted(new_models.keys() - old_models.keys()),
+        "removed": sorted(old_models.keys() - new_models.keys()),
+        "changed": {
+            name: _diff_model(old_models[name], new_models[name])
+            for name in _changed_names(old_models, new_models)
+        },
+    }
+
+
+def _load_spec(source: str) -> Dict[str, Any]:
+    if source.endswith(".json"):
+        with open(source) as file:
+            return json.load(file)
+    module_name, _, attr = source.partition(":")
+    base = getattr(importlib.import_module(module_name), attr or "Base")
+    # keep conversion messages out of the printed diff
+    with contextlib.redirect_stdout(sys.stderr):
+        models = sqlalchemy_base_to_ormar(
+            base, metadata=MetaData(), database=Database("sqlite://")
+        )
+    return schema_spec(models.values())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare ormar models converted from two sqlalchemy schemas."
+    )
+    parser.add_argument(
+        "old", help="json spec file or import path to declarative base (module:Base)"
+    )
+    parser.add_argument(
+        "new",
+        nargs="?",
+        help="json spec file or import path to declarative base (module:Base)",
+    )
+    parser.add_argument("--dump", help="save spec of the last schema to json file")
+    parser.add_argument(
+        "--app-dir",
+        default=".",
+        help="directory added to python path to import declarative bases from, "
+        "defaults to the current directory",
+    )
+    args = parser.parse_args(argv)
+    # console scripts do not have the current directory on python path
+    sys.path.insert(0, os.path.abspath(args.app_dir))
+    old = _load_spec(args.old)
+    new = _load_spec(args.new) if args.new else old
+    if args.dump:
+        with open(args.dump, "w") as file:
+            json.dump(new, file, indent=2, sort_keys=True)
+    diff = diff_schemas(old, new)
+    print(json.dumps(diff, indent=2, sort_keys=True))
+    return 1 if any(diff.values()) else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
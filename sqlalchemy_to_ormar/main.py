@@ -1,81 +1,269 @@
-from typing import Container, Dict, Type, cast
+import datetime
+import decimal
+import enum
+import hashlib
+import json
+import keyword
+import uuid
+import warnings
+import weakref
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Container,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    cast,
+)
 
 import ormar
 import sqlalchemy
 from databases import Database
 from ormar import ForeignKeyField, Model
 from pydantic.typing import ForwardRef
-from sqlalchemy import MetaData, Table
+from sqlalchemy import Column, MetaData, Table
+from sqlalchemy.exc import CompileError
 from sqlalchemy.inspection import inspect
 from sqlalchemy.orm import Mapper
+from sqlalchemy.schema import DefaultClause
+from sqlalchemy.sql.elements import BindParameter, ClauseElement
+from sqlalchemy.sql.functions import FunctionElement, next_value
 
 from sqlalchemy_to_ormar.maps import (
     COMMON_PARAMETERS,
     CURRENTLY_PROCESSED,
     FIELD_MAP,
+    FORWARD_REF_WAITERS,
     PARSED_MODELS,
+    PARSED_THROUGH_TABLES,
     TYPE_SPECIFIC_PARAMETERS,
 )
 
+T = TypeVar("T")
+
 
 def sqlalchemy_to_ormar(
     db_model: Type,
     *,
     metadata: MetaData,
     database: Database,
-    exclude: Container[str] = None,
+    exclude: Collection[str] = None,
+    include: Collection[str] = None,
+    projections: Dict[str, Dict[str, Collection[str]]] = None,
     reverse: bool = False,
 ) -> Type[Model]:
+    """
+    Converts sqlalchemy declarative model into ormar Model.
+
+    Related models are converted recursively. `exclude` and `include` apply
+    only to the passed model, while `projections` (a dict of model name -> dict
+    with `include` and/or `exclude` keys, where `"*"` matches every model)
+    is applied to each model converted during recursion.
+    Primary key columns are always kept, unique constraints with columns
+    that are left out are skipped.
+
+    Note that already converted models are cached and returned as they were
+    converted at the first time, `exclude`, `include` and `projections`
+    passed for already converted model are ignored with a warning.
+
+    `reverse` is deprecated and has no effect, many to many relations
+    are declared on the model converted first.
+    """
+    if reverse:
+        warnings.warn(
+            "reverse parameter is deprecated and has no effect",
+            DeprecationWarning,
+            stacklevel=2,
+        )
     if db_model in PARSED_MODELS:
+        if exclude or include is not None or projections:
+            warnings.warn(
+                f"{db_model.__name__} is already converted, "
+                f"exclude, include and projections are ignored",
+                stacklevel=2,
+            )
         return PARSED_MODELS[db_model]
 
     CURRENTLY_PROCESSED.add(db_model)
+    try:
+        model = _convert_model(
+            db_model=db_model,
+            metadata=metadata,
+            database=database,
+            exclude=exclude,
+            include=include,
+            projections=projections,
+        )
+    except BaseException:
+        _discard_forward_refs(db_model)
+        raise
+    finally:
+        CURRENTLY_PROCESSED.discard(db_model)
+    print(f"adding model {model}")
+    PARSED_MODELS[db_model] = model
+    _update_forward_refs(db_model)
+    return model
+
 
-    exclude = exclude or []
+def _convert_model(
+    db_model: Type,
+    metadata: MetaData,
+    database: Database,
+    exclude: Optional[Collection[str]],
+    include: Optional[Collection[str]],
+    projections: Optional[Dict[str, Dict[str, Collection[str]]]],
+) -> Type[Model]:
+    projected_include, projected_exclude = _get_projection(
+        db_model=db_model, projections=projections
+    )
+    if include is not None:
+        projected_include = set(include)
+    projected_exclude.update(exclude or [])
     mapper = inspect(db_model)
     table = mapper.tables[0]
     fields: Dict[str, Dict] = {}
-    fields = _extract_db_columns(table=table, exclude=exclude, fields=fields)
+    fields = _extract_db_columns(
+        table=table,
+        exclude=projected_exclude,
+        fields=fields,
+        include=projected_include,
+    )
     fields = _extract_relations(
         mapper=mapper,
         fields=fields,
-        reverse=reverse,
         metadata=metadata,
         database=database,
         db_model=db_model,
+        include=projected_include,
+        exclude=projected_exclude,
+        projections=projections,
+    )
+    Meta = _build_model_meta(
+        table=table,
+        metadata=metadata,
+        database=database,
+        columns={x["name"] for x in fields.values() if x.get("name")},
     )
-    Meta = _build_model_meta(table=table, metadata=metadata, database=database)
 
     ready_fields = {
         k: v.get("type")(**{z: x for z, x in v.items() if z != "type"})  # type: ignore
         for k, v in fields.items()
     }
     model = type(f"{db_model.__name__}", (ormar.Model,), {"Meta": Meta, **ready_fields})
-    model = cast(Type[Model], model)
-    print(f"adding model {model}")
-    PARSED_MODELS[db_model] = model
-    CURRENTLY_PROCESSED.remove(db_model)
-    _update_refs_in_related(model)
-    return model
+    return cast(Type[Model], model)
 
 
-def _update_refs_in_related(model: Type[Model]):
-    fields_dict = list(model.Meta.model_fields.items())
-    for name, field in fields_dict:
-        if field.is_relation:
-            target = model.Meta.model_fields[name].to
-            if target.__class__ != ForwardRef:
-                target.update_forward_refs(
-                    **{k.__name__: v for k, v in PARSED_MODELS.items()}
-                )
-            else:
-                if target.__forward_arg__ == model.__name__:  # type: ignore
-                    model.update_forward_refs(**{model.__name__: model})
+def sqlalchemy_base_to_ormar(
+    base: Type,
+    *,
+    metadata: MetaData,
+    database: Database,
+    projections: Dict[str, Dict[str, Collection[str]]] = None,
+) -> Dict[str, Type[Model]]:
+    """
+    Converts all models registered in sqlalchemy declarative base.
+
+    Returns dictionary of model name -> ormar Model.
+    """
+    db_models = _declarative_models(base)
+    converted_before = {x for x in db_models if x in PARSED_MODELS}
+    models: Dict[str, Type[Model]] = {}
+    for db_model in db_models:
+        # models converted as related models during this call are projected
+        if db_model in PARSED_MODELS and db_model not in converted_before:
+            models[db_model.__name__] = PARSED_MODELS[db_model]
+            continue
+        models[db_model.__name__] = sqlalchemy_to_ormar(
+            db_model, metadata=metadata, database=database, projections=projections
+        )
+    return models
+
+
+def _declarative_models(base: Type) -> List[Type]:
+    return sorted(
+        (
+            x
+            for x in base._decl_class_registry.values()
+            if isinstance(x, type) and hasattr(x, "__table__")
+        ),
+        key=lambda x: x.__name__,
+    )
+
+
+def _update_forward_refs(db_model: Type) -> None:
+    """
+    Resolves forward references of models waiting for conversion of given model.
+    Models in relation loops wait until all their related models are converted.
+    """
+    for waiter in list(FORWARD_REF_WAITERS.pop(db_model, ())):
+        related = {
+            x.entity.class_.__name__: x.entity.class_
+            for x in inspect(waiter).relationships
+        }
+        model = PARSED_MODELS[waiter]
+        pending = {
+            field.to.__forward_arg__: related[field.to.__forward_arg__]
+            for field in model.Meta.model_fields.values()
+            if field.is_relation and field.to.__class__ == ForwardRef
+        }
+        if pending and all(x in PARSED_MODELS for x in pending.values()):
+            model.update_forward_refs(
+                **{name: PARSED_MODELS[x] for name, x in pending.items()}
+            )
+
+
+def _discard_forward_refs(db_model: Type) -> None:
+    """
+    Stops given model, which failed to convert, from waiting for related models.
+    Models waiting for given model are kept, so they are resolved once
+    the conversion of given model succeeds.
+    """
+    for waiters in list(FORWARD_REF_WAITERS.values()):
+        waiters.discard(db_model)
+
 
+def _get_projection(
+    db_model: Type, projections: Optional[Dict[str, Dict[str, Collection[str]]]]
+) -> Tuple[Optional[Set[str]], Set[str]]:
+    projections = projections or {}
+    include: Optional[Set[str]] = None
+    exclude: Set[str] = set()
+    for key in ("*", db_model.__name__):
+        projection = projections.get(key, {})
+        if projection.get("include") is not None:
+            include = set(projection["include"])
+        exclude.update(projection.get("exclude", []))
+    return include, exclude
 
-def _extract_db_columns(table: Table, exclude: Container[str], fields: Dict) -> Dict:
+
+def _is_projected(
+    names: Iterable[str], include: Optional[Set[str]], exclude: Set[str]
+) -> bool:
+    if any(name in exclude for name in names):
+        return False
+    return include is None or any(name in include for name in names)
+
+
+def _extract_db_columns(
+    table: Table,
+    exclude: Collection[str],
+    fields: Dict,
+    include: Optional[Set[str]] = None,
+) -> Dict:
+    exclude = set(exclude)
     for column in table.columns:
-        if column.key in exclude or column.foreign_keys:
+        if column.foreign_keys:
+            continue
+        if not column.primary_key and not _is_projected(
+            names=[column.key], include=include, exclude=exclude
+        ):
             continue
         field_definition = dict()
         field_type = column.type.__visit_name__.lower()  # type: ignore
@@ -84,6 +272,7 @@ def _extract_db_columns(table: Table, exclude: Container[str], fields: Dict) ->
                 column, field_def.get("key", ""), None
             ) or field_def.get("default")
             field_definition["type"] = FIELD_MAP.get(field_type)
+        field_definition.update(_extract_defaults(column))
         if field_definition.get("primary_key") and field_type in [
             "integer",
             "small_integer",
@@ -103,57 +292,96 @@ def _extract_db_columns(table: Table, exclude: Container[str], fields: Dict) ->
     return fields
 
 
+def _extract_defaults(column: Column) -> Dict[str, Any]:
+    """
+    Unwraps sqlalchemy defaults, so ormar can use them.
+
+    Scalars and callables stay python side defaults, while sql expressions
+    and sequences (for non primary key columns) become server defaults.
+    Callables accepting sqlalchemy execution context and sequences of primary
+    keys are skipped with a warning.
+    """
+    default = None
+    server_default = None
+    column_default = column.default
+    if column_default is not None:
+        if column_default.is_sequence:
+            if column.primary_key:
+                _warn_skipped_default(column, "sequence of primary key")
+            else:
+                server_default = column_default.next_value()
+        elif column_default.is_clause_element:
+            server_default = column_default.arg
+        elif column_default.is_callable:
+            default = getattr(column_default.arg, "__wrapped__", None)
+            if default is None:
+                _warn_skipped_default(column, "callable using execution context")
+        else:
+            default = column_default.arg
+    if isinstance(column.server_default, DefaultClause):
+        server_default = column.server_default.arg
+    return dict(default=default, server_default=server_default)
+
+
+def _warn_skipped_default(column: Column, kind: str) -> None:
+    warnings.warn(
+        f"Default of column {column.table.name}.{column.key} ({kind}) "
+        f"is not supported by ormar and is skipped"
+    )
+
+
 def _extract_relations(
     mapper: Mapper,
     fields: Dict,
-    reverse: bool,
     metadata: MetaData,
     database: Database,
     db_model: Type,
+    include: Optional[Set[str]] = None,
+    exclude: Set[str] = None,
+    projections: Dict[str, Dict[str, Collection[str]]] = None,
 ) -> Dict:
+    exclude = exclude or set()
     for attr in mapper.attrs:  # type: ignore
         if isinstance(attr, sqlalchemy.orm.RelationshipProperty):
             # skip one to many, it will be populated later by ormar
             # if attr.direction.name == "ONETOMANY":
             #     continue
+            names = [attr.key]
             if attr.direction.name == "MANYTOONE":
-                # we use forward ref as target might not be populated
-                target_sqlalchemy = attr.entity.class_
-                if (
-                    target_sqlalchemy not in PARSED_MODELS
-                    and target_sqlalchemy not in CURRENTLY_PROCESSED
-                    and not target_sqlalchemy == db_model
-                ):
-                    PARSED_MODELS[target_sqlalchemy] = sqlalchemy_to_ormar(
-                        target_sqlalchemy, metadata=metadata, database=database
-                    )
-                    target = PARSED_MODELS[target_sqlalchemy]
-                else:
-                    target = ForwardRef(target_sqlalchemy.__name__)  # type: ignore
-
+                names.extend(column.key for column in attr.local_columns)
+            if not _is_projected(names=names, include=include, exclude=exclude):
+                continue
+            if attr.direction.name == "MANYTOONE":
+                target = _get_relation_target(
+                    target_sqlalchemy=attr.entity.class_,
+                    db_model=db_model,
+                    metadata=metadata,
+                    database=database,
+                    projections=projections,
+                )
                 column = next(iter(attr.local_columns))
                 sql_fk = next(iter(column.foreign_keys))
                 fields[attr.key] = dict(
                     type=ormar.ForeignKey,
                     to=target,
                     name=column.key,
+                    nullable=column.nullable,
                     related_name=attr.back_populates,
                     onupdate=getattr(sql_fk, "onupdate", None),
                     ondelete=getattr(sql_fk, "ondelete", None),
                 )
             elif attr.direction.name == "MANYTOMANY":
-                target_sqlalchemy = attr.entity.class_
-                if target_sqlalchemy not in PARSED_MODELS and not reverse:
-                    PARSED_MODELS[target_sqlalchemy] = sqlalchemy_to_ormar(
-                        target_sqlalchemy,
-                        metadata=metadata,
-                        database=database,
-                        reverse=True,
-                    )
-                else:  # pragma: no cover
-                    # target model already should have m2m relation
+                # relation is declared only on the side that is converted first
+                if attr.secondary in PARSED_THROUGH_TABLES:
                     continue
-                target = PARSED_MODELS[target_sqlalchemy]
+                PARSED_THROUGH_TABLES.add(attr.secondary)
+                target = _get_relation_target(
+                    target_sqlalchemy=attr.entity.class_,
+                    db_model=db_model,
+                    metadata=metadata,
+                    database=database,
+                    projections=projections,
+                )
                 through_table_name = attr.secondary.key
                 fields[attr.key] = dict(
                     type=ormar.ManyToMany,
@@ -169,16 +397,44 @@ def _extract_relations(
     return fields
 
 
+def _get_relation_target(
+    target_sqlalchemy: Type,
+    db_model: Type,
+    metadata: MetaData,
+    database: Database,
+    projections: Optional[Dict[str, Dict[str, Collection[str]]]],
+) -> Any:
+    if target_sqlalchemy in PARSED_MODELS:
+        return PARSED_MODELS[target_sqlalchemy]
+    if target_sqlalchemy in CURRENTLY_PROCESSED or target_sqlalchemy == db_model:
+        # we use forward ref as target is not populated yet
+        FORWARD_REF_WAITERS.setdefault(target_sqlalchemy, weakref.WeakSet()).add(
+            db_model
+        )
+        return ForwardRef(target_sqlalchemy.__name__)  # type: ignore
+    return sqlalchemy_to_ormar(
+        target_sqlalchemy,
+        metadata=metadata,
+        database=database,
+        projections=projections,
+    )
+
+
 def _build_model_meta(
-    table: Table, metadata: MetaData, database: Database
+    table: Table,
+    metadata: MetaData,
+    database: Database,
+    columns: Container[str],
 ) -> Type[ormar.ModelMeta]:
-    # constraints
+    # constraints, skipping ones with columns left out by projections
     constraints = []
     for const in table.constraints:
         if isinstance(const, sqlalchemy.UniqueConstraint):
-            constraints.append(
-                ormar.UniqueColumns(*const._pending_colargs)  # type: ignore
-            )
+            names = [
+                getattr(x, "name", x) for x in const._pending_colargs  # type: ignore
+            ]
+            if all(x in columns for x in names):
+                constraints.append(ormar.UniqueColumns(*names))
 
     Meta = type(
         "Meta",
@@ -213,8 +469,17 @@ def create_through_model(
 
 
 def ormar_model_str_repr(
-    model: Type[ormar.Model], skip_names_if_match: bool = True
+    model: Type[ormar.Model],
+    skip_names_if_match: bool = True,
+    forward_refs: Container[str] = (),
 ) -> str:
+    """
+    Returns source code of ormar model definition.
+
+    Fields are ordered with primary key first and then by name, constraints
+    are ordered by column names, so the output does not depend on conversion order.
+    Relations to models named in `forward_refs` are rendered as `ForwardRef`.
+    """
     pad = "    "
     definition = (
         f"\n"
@@ -233,9 +498,11 @@ def ormar_model_str_repr(
                 )
                 constraints.append(f"ormar.UniqueColumns({args})")
 
-        definition += f"{pad}{pad}constraints=[{', '.join(constraints)}]\n"
+        definition += f"{pad}{pad}constraints=[{', '.join(sorted(constraints))}]\n"
     definition += "\n"
-    for field in model.Meta.model_fields.values():
+    for field in sorted(
+        model.Meta.model_fields.values(), key=lambda x: (not x.primary_key, x.name)
+    ):
         if field.is_relation and field.virtual:
             continue
         field_definition = dict()
@@ -244,8 +511,11 @@ def ormar_model_str_repr(
         remap_params = {"default": "ormar_default", "name": "db_alias"}
         for param, field_def in COMMON_PARAMETERS.items():
             param_name = remap_params.get(param, param)
-            if getattr(field, param_name, None) != field_def.get("default"):
-                field_definition[param] = getattr(field, param_name, None)
+            param_val = getattr(field, param_name, None)
+            if not _is_param_default(param_val, field_def.get("default")) and (
+                _value_str_repr(param_val) is not None
+            ):
+                field_definition[param] = param_val
         if skip_names_if_match and field_definition.get("name") == field_name:
             field_definition.pop("name", None)
         if field_definition.get("primary_key"):
@@ -255,26 +525,422 @@ def ormar_model_str_repr(
             for param in type_params.keys():
                 param_val = getattr(field, param, None)
                 field_definition[param] = param_val
-        params = ["=".join([str(k), str(v)]) for k, v in field_definition.items()]
-        params_str = ", ".join(sorted(params))
-        if field_type == "ForeignKey":
-            field = cast(ForeignKeyField, field)
-            rel_params = (
-                f"to={field.to.get_name(lower=False)}, "
-                f'related_name="{field.related_name}", '
-            )
-            if field.onupdate:
-                rel_params += f'onupdate="{field.onupdate}", '
-            if field.ondelete:
-                rel_params += f'ondelete="{field.ondelete}", '
-            params_str = rel_params + params_str
-        if field_type == "ManyToMany":
+        rendered = {k: _value_str_repr(v) for k, v in field_definition.items()}
+        params_str = ", ".join(
+            sorted(f"{k}={v}" for k, v in rendered.items() if v is not None)
+        )
+        if field.is_relation:
             field = cast(ForeignKeyField, field)
-            rel_params = (
-                f"to={field.to.get_name(lower=False)}, "
-                f"through={field.through.get_name(lower=False)}, "
-                f'related_name="{field.related_name}", '
-            )
-            params_str = rel_params + params_str
+            params_str = _relation_params_str(field, forward_refs) + params_str
         definition += f"{pad}{field_name} = ormar.{field_type}({params_str})\n"
     return definition
+
+
+def _relation_params_str(field: ForeignKeyField, forward_refs: Container[str]) -> str:
+    params = [f"to={_target_str_repr(field, forward_refs)}"]
+    if field.is_multi:
+        params.append(f"through={field.through.get_name(lower=False)}")
+    if field.related_name:
+        params.append(f'related_name="{field.related_name}"')
+    if not field.is_multi:
+        params.extend(
+            f'{param}="{getattr(field, param)}"'
+            for param in ("onupdate", "ondelete")
+            if getattr(field, param)
+        )
+    return "".join(f"{x}, " for x in params)
+
+
+def _is_param_default(value: Any, default: Any) -> bool:
+    # compare types first, as 0 == False and clause elements overload ==
+    return value is default or (type(value) is type(default) and value == default)
+
+
+def _value_str_repr(value: Any) -> Optional[str]:
+    """
+    Returns python source of given value, or None if it cannot be rendered
+    (i.e. lambdas, local functions or objects without importable constructor).
+    """
+    if isinstance(value, str):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, enum.Enum):
+        return _importable_str_repr(type(value), suffix=f".{value.name}")
+    if value is None or isinstance(value, (bool, int, float)):
+        return repr(value)
+    for value_type, str_repr in _TYPE_STR_REPRS.items():
+        if isinstance(value, value_type):
+            return str_repr(value)
+    if callable(value):
+        return _importable_str_repr(value)
+    return None
+
+
+def _importable_str_repr(value: Any, suffix: str = "") -> Optional[str]:
+    module = _value_module(value)
+    qualname = getattr(value, "__qualname__", "")
+    if module and qualname and "<" not in qualname:
+        return f"{module}.{qualname}{suffix}"
+    return None
+
+
+def _datetime_str_repr(value: Any) -> Optional[str]:
+    tzinfo = getattr(value, "tzinfo", None)
+    if tzinfo is not None and not isinstance(tzinfo, datetime.timezone):
+        return None
+    return repr(value)
+
+
+def _clause_str_repr(value: ClauseElement) -> Optional[str]:
+    if isinstance(value, next_value):
+        return f'sqlalchemy.Sequence("{value.sequence.name}").next_value()'
+    if isinstance(value, FunctionElement) and all(
+        isinstance(x, BindParameter) for x in value.clauses
+    ):
+        args = [_value_str_repr(x.value) for x in value.clauses]
+        if None not in args:
+            return f"sqlalchemy.func.{value.name}({', '.join(args)})"  # type: ignore
+    try:
+        sql = str(value.compile(compile_kwargs={"literal_binds": True}))
+    except (CompileError, NotImplementedError):
+        return None
+    # colons would be parsed as bind parameters by sqlalchemy.text
+    escaped = sql.replace(":", "\\:")
+    return f"sqlalchemy.text({escaped!r})"
+
+
+# renderers of values by type, used by `_value_str_repr`
+_TYPE_STR_REPRS: Dict[Type, Callable[[Any], Optional[str]]] = {
+    decimal.Decimal: lambda x: f"decimal.Decimal({str(x)!r})",
+    uuid.UUID: lambda x: f"uuid.UUID({str(x)!r})",
+    datetime.date: _datetime_str_repr,
+    datetime.time: _datetime_str_repr,
+    datetime.timedelta: _datetime_str_repr,
+    ClauseElement: _clause_str_repr,
+}
+
+
+def _value_module(value: Any) -> Optional[str]:
+    if isinstance(value, decimal.Decimal):
+        return "decimal"
+    if isinstance(value, uuid.UUID):
+        return "uuid"
+    if isinstance(value, (datetime.date, datetime.time, datetime.timedelta)):
+        return "datetime"
+    if isinstance(value, ClauseElement):
+        return "sqlalchemy"
+    if isinstance(value, enum.Enum):
+        return type(value).__module__
+    if callable(value):
+        return getattr(value, "__module__", None) or getattr(
+            getattr(value, "__self__", None), "__module__", None
+        )
+    return None
+
+
+def _model_imports(model: Type[ormar.Model]) -> Set[str]:
+    imports = set()
+    for field in model.Meta.model_fields.values():
+        for value in (field.ormar_default, field.server_default):
+            module = _value_module(value)
+            if module and _value_str_repr(value) is not None:
+                imports.add(module)
+    return imports
+
+
+def _target_str_repr(field: ForeignKeyField, forward_refs: Container[str]) -> str:
+    target = field.to.get_name(lower=False)
+    return f'ForwardRef("{target}")' if target in forward_refs else target
+
+
+def _through_model_str_repr(model: Type[ormar.Model]) -> str:
+    pad = "    "
+    return (
+        f"\n"
+        f"class {model.get_name(lower=False)}(ormar.Model):\n"
+        f"\n{pad}class Meta(ormar.ModelMeta):\n"
+        f"{pad * 2}metadata=metadata\n"
+        f"{pad * 2}database=database\n"
+        f'{pad * 2}tablename="{model.Meta.tablename}"\n'
+    )
+
+
+def _with_content_hash(definition: str) -> str:
+    content_hash = hashlib.sha256(definition.encode()).hexdigest()[:16]
+    return f"\n# content-hash: {content_hash}{definition}"
+
+
+def _sort_models(
+    models: Iterable[Type[ormar.Model]],
+    dependencies: Callable[[Type[ormar.Model]], Set[str]],
+) -> List[Type[ormar.Model]]:
+    by_name = {model.get_name(lower=False): model for model in models}
+    ordered: List[Type[ormar.Model]] = []
+    visited: Set[str] = set()
+
+    def visit(name: str) -> None:
+        if name in visited or name not in by_name:
+            return
+        visited.add(name)
+        for dependency in sorted(dependencies(by_name[name])):
+            visit(dependency)
+        ordered.append(by_name[name])
+
+    for name in sorted(by_name):
+        visit(name)
+    return ordered
+
+
+def _unresolved_names(
+    model: Type[ormar.Model], cluster: List[Type[ormar.Model]]
+) -> Set[str]:
+    """
+    Returns names of models in cluster that have a relation field named like
+    given model. Ormar verifies such fields when registering reverse relations
+    of given model, so they have to be resolved first.
+    """
+    names = {x.get_name(lower=False) for x in cluster}
+    field_name = model.get_name()
+    return {
+        other.get_name(lower=False)
+        for other in cluster
+        if other is not model and field_name in _relation_fields(other, names)
+    }
+
+
+def _relation_fields(model: Type[ormar.Model], targets: Container[str]) -> Set[str]:
+    return {
+        name
+        for name, field in model.Meta.model_fields.items()
+        if field.is_relation
+        and not field.virtual
+        and field.to.get_name(lower=False) in targets
+    }
+
+
+def _relation_targets(model: Type[ormar.Model]) -> Set[str]:
+    return {
+        field.to.get_name(lower=False)
+        for field in model.Meta.model_fields.values()
+        if field.is_relation and not field.virtual
+    }
+
+
+def _through_models(models: Iterable[Type[ormar.Model]]) -> List[Type[ormar.Model]]:
+    through_models = {
+        field.through.get_name(lower=False): field.through
+        for model in models
+        for field in model.Meta.model_fields.values()
+        if field.is_multi and not field.virtual
+    }
+    return [through_models[name] for name in sorted(through_models)]
+
+
+def ormar_models_module_str_repr(
+    models: Iterable[Type[ormar.Model]],
+    skip_names_if_match: bool = True,
+    preamble: str = "",
+) -> str:
+    """
+    Returns source code of python module with definitions of all passed models.
+
+    Models are ordered by their relations and names, relations between models
+    with circular relations are declared with `ForwardRef`s and resolved after
+    all of those models are defined. Each model definition is
+    preceded with a comment with its content hash, so unchanged models can be
+    recognized between subsequent generations.
+    Module expects `metadata` and `database` names to be defined in `preamble`.
+    """
+    return _module_str_repr(
+        models=models, skip_names_if_match=skip_names_if_match, preamble=preamble
+    )
+
+
+def _module_str_repr(
+    models: Iterable[Type[ormar.Model]],
+    skip_names_if_match: bool,
+    preamble: str,
+    imports: Dict[str, str] = None,
+) -> str:
+    imports = imports or {}
+    clusters = _model_clusters(models)
+    imports_str = "".join(
+        f"import {x}\n"
+        for x in sorted(
+            {"ormar"}.union(*(_model_imports(x) for c in clusters for x in c))
+        )
+    )
+    module = f"{imports_str}from pydantic.typing import ForwardRef\n\n{preamble}\n"
+    for name, module_name in sorted(imports.items(), key=lambda x: (x[1], x[0])):
+        module += f"from .{module_name} import {name}\n"
+    for through_model in _through_models(x for c in clusters for x in c):
+        module += _with_content_hash(_through_model_str_repr(through_model))
+    for cluster in clusters:
+        names = {x.get_name(lower=False) for x in cluster}
+        for model in cluster:
+            module += _with_content_hash(
+                ormar_model_str_repr(
+                    model,
+                    skip_names_if_match=skip_names_if_match,
+                    forward_refs=_relation_targets(model) & names,
+                )
+            )
+        to_update = [
+            x
+            for x in _sort_models(cluster, lambda x: _unresolved_names(x, cluster))
+            if _relation_targets(x) & names
+        ]
+        if to_update:
+            module += "\n"
+        for model in to_update:
+            refs = ", ".join(
+                f"{x}={x}" for x in sorted(_relation_targets(model) & names)
+            )
+            module += f"{model.get_name(lower=False)}.update_forward_refs({refs})\n"
+    return module
+
+
+def _model_clusters(
+    models: Iterable[Type[ormar.Model]],
+) -> List[List[Type[ormar.Model]]]:
+    """
+    Returns clusters of models with circular relations, ordered so that
+    each cluster follows clusters of its related models.
+    """
+    return _clusters(
+        {model.get_name(lower=False): model for model in models}, _relation_targets
+    )
+
+
+def _clusters(by_name: Dict[str, T], targets: Callable[[T], Set[str]]) -> List[List[T]]:
+    """
+    Returns strongly connected components of graph of named nodes
+    (Tarjan's algorithm), visiting nodes and their targets sorted by name.
+    Each component follows the components of its targets.
+    """
+    indexes: Dict[str, int] = {}
+    low_links: Dict[str, int] = {}
+    stack: List[str] = []
+    clusters: List[List[T]] = []
+
+    def connect(name: str) -> None:
+        indexes[name] = low_links[name] = len(indexes)
+        stack.append(name)
+        for target in sorted(targets(by_name[name]) & by_name.keys()):
+            if target not in indexes:
+                connect(target)
+                low_links[name] = min(low_links[name], low_links[target])
+            elif target in stack:
+                low_links[name] = min(low_links[name], indexes[target])
+        if low_links[name] == indexes[name]:
+            cluster = _pop_cluster(stack, name)
+            clusters.append([by_name[x] for x in sorted(cluster)])
+
+    for name in sorted(by_name):
+        if name not in indexes:
+            connect(name)
+    return clusters
+
+
+def _pop_cluster(stack: List[str], root: str) -> List[str]:
+    # root of the component and all nodes above it on the stack
+    index = stack.index(root)
+    cluster = stack[index:]
+    del stack[index:]
+    return cluster
+
+
+def ormar_models_package_str_repr(
+    models: Iterable[Type[ormar.Model]],
+    skip_names_if_match: bool = True,
+    preamble: str = "",
+) -> Dict[str, str]:
+    """
+    Returns source code of python package with definitions of all passed models,
+    as dictionary of file name -> module source code.
+
+    Each model lands in its own module, apart from models with circular
+    relations that share one module. Models import only modules of related
+    models, and package `__init__.py` imports the modules lazily on attribute
+    access, so importing one model does not import all of them.
+    Note that reverse relations are registered only on imported models.
+
+    Modules expect `metadata` and `database` names to be defined in `preamble`.
+    """
+    clusters = _model_clusters(models)
+    module_names: Dict[str, str] = {}
+    taken: Set[str] = set()
+    for cluster in clusters:
+        module_name = _module_name(cluster, taken)
+        taken.add(module_name)
+        for model in [*cluster, *_through_models(cluster)]:
+            module_names[model.get_name(lower=False)] = module_name
+    package: Dict[str, str] = {}
+    for cluster in clusters:
+        names = {x.get_name(lower=False) for x in cluster}
+        imports = {
+            target: module_names[target]
+            for model in cluster
+            for target in _relation_targets(model) - names
+            if target in module_names
+        }
+        module_name = module_names[cluster[0].get_name(lower=False)]
+        package[f"{module_name}.py"] = _module_str_repr(
+            models=cluster,
+            skip_names_if_match=skip_names_if_match,
+            preamble=preamble,
+            imports=imports,
+        )
+    package["__init__.py"] = _package_init_str_repr(module_names)
+    return dict(sorted(package.items()))
+
+
+def _module_name(cluster: List[Type[ormar.Model]], taken: Container[str]) -> str:
+    """
+    Returns module name for cluster of models - name of the first model,
+    followed by short hash of all cluster model names if the cluster has more
+    than one model or the name is already taken or is a python keyword
+    (that can not be imported).
+    """
+    module_name = cluster[0].get_name()
+    names = ",".join(x.get_name(lower=False) for x in cluster)
+    suffix = 0
+    while len(cluster) > 1 or module_name in taken or keyword.iskeyword(module_name):
+        key = f"{names}:{suffix}" if suffix else names
+        cluster_hash = hashlib.sha256(key.encode()).hexdigest()[:8]
+        module_name = f"{cluster[0].get_name()}_{cluster_hash}"
+        if module_name not in taken:
+            break
+        suffix += 1
+    return module_name
+
+
+def _package_init_str_repr(module_names: Dict[str, str]) -> str:
+    pad = "    "
+    registry = "".join(
+        f'{pad}"{name}": "{module_names[name]}",\n' for name in sorted(module_names)
+    )
+    # module level __getattr__ is not supported before python 3.7
+    return (
+        f"import importlib\n"
+        f"import sys\n"
+        f"import types\n"
+        f"\n"
+        f"_MODULES = {{\n{registry}}}\n"
+        f"\n"
+        f"__all__ = list(_MODULES)\n"
+        f"\n"
+        f"\n"
+        f"class _LazyModule(types.ModuleType):\n"
+        f"{pad}def __getattr__(self, name):\n"
+        f"{pad * 2}if name in _MODULES:\n"
+        f"{pad * 3}module = importlib.import_module(\n"
+        f'{pad * 4}"." + _MODULES[name], self.__name__\n'
+        f"{pad * 3})\n"
+        f"{pad * 3}return getattr(module, name)\n"
+        f"{pad * 2}raise AttributeError(\n"
+        f'{pad * 3}f"module {{self.__name__!r}} has no attribute {{name!r}}"\n'
+        f"{pad * 2})\n"
+        f"\n"
+        f"\n"
+        f"sys.modules[__name__].__class__ = _LazyModule\n"
+    )
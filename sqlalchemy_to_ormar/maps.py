@@ -1,4 +1,5 @@
-from typing import Dict, Set, Type
+import weakref
+from typing import Dict, MutableMapping, MutableSet, Type
 
 import ormar
 from ormar import Model
@@ -44,5 +45,13 @@ COMMON_PARAMETERS: Dict[str, Dict] = dict(
     default={"key": "default", "default": None},
     server_default={"key": "server_default", "default": None},
 )
-PARSED_MODELS: Dict[Type, Type[Model]] = dict()
-CURRENTLY_PROCESSED: Set = set()
+# weak keys so models are released together with sqlalchemy models
+PARSED_MODELS: MutableMapping[Type, Type[Model]] = weakref.WeakKeyDictionary()
+# association tables of already converted many to many relations
+PARSED_THROUGH_TABLES: MutableSet = weakref.WeakSet()
+# models with forward references waiting for conversion of related model,
+# keyed by the related model
+FORWARD_REF_WAITERS: MutableMapping[
+    Type, MutableSet[Type]
+] = weakref.WeakKeyDictionary()
+CURRENTLY_PROCESSED: MutableSet = weakref.WeakSet()
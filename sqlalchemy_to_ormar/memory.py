@@ -0,0 +1,79 @@
+import gc
+import tracemalloc
+from typing import Any, Collection, Dict, Set, Type
+
+from databases import Database
+from sqlalchemy import MetaData
+from sqlalchemy.inspection import inspect
+
+from sqlalchemy_to_ormar.main import (
+    _clusters,
+    _declarative_models,
+    sqlalchemy_to_ormar,
+)
+from sqlalchemy_to_ormar.maps import PARSED_MODELS
+
+
+def _traced_memory() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def _relation_targets(db_model: Type) -> Set[str]:
+    # models converted recursively with given model
+    return {
+        x.entity.class_.__name__
+        for x in inspect(db_model).relationships
+        if x.direction.name in ("MANYTOONE", "MANYTOMANY")
+    }
+
+
+def conversion_memory_report(
+    base: Type,
+    *,
+    metadata: MetaData,
+    database: Database,
+    projections: Dict[str, Dict[str, Collection[str]]] = None,
+) -> Dict[str, Any]:
+    """
+    Converts all models from sqlalchemy declarative base and reports memory
+    retained after conversion of each model, measured with tracemalloc.
+
+    Models are converted after their related models, so each model is measured
+    on its own, apart from models with circular relations that are converted
+    together - they share one measurement listing all of them in `models`.
+    Through models and metadata tables created during conversion are included
+    in the retained bytes and listed in the report.
+    """
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        start = _traced_memory()
+        report: Dict[str, Any] = {"models": {}}
+        by_name = {x.__name__: x for x in _declarative_models(base)}
+        for db_model in (x for c in _clusters(by_name, _relation_targets) for x in c):
+            if db_model in PARSED_MODELS:
+                continue
+            models_before = set(PARSED_MODELS.keys())
+            tables_before = set(metadata.tables.keys())
+            before = _traced_memory()
+            sqlalchemy_to_ormar(
+                db_model, metadata=metadata, database=database, projections=projections
+            )
+            converted = sorted(
+                x.__name__ for x in set(PARSED_MODELS.keys()) - models_before
+            )
+            measurement = {
+                "bytes": _traced_memory() - before,
+                "models": converted,
+                "tables": sorted(metadata.tables.keys() - tables_before),
+            }
+            for name in converted:
+                report["models"][name] = measurement
+        report["models"] = dict(sorted(report["models"].items()))
+        report["total"] = _traced_memory() - start
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return report
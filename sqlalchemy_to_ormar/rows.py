@@ -0,0 +1,78 @@
+from typing import Any, Iterable, List, NamedTuple, Optional, Tuple, Type, cast
+
+import ormar
+from ormar import ForeignKeyField, Model
+
+
+def _row_fields(model: Type[Model]) -> List[Tuple[str, str, Type]]:
+    row_fields = []
+    for field in model.Meta.model_fields.values():
+        if field.virtual or field.is_multi:
+            continue
+        if field.is_relation:
+            field = cast(ForeignKeyField, field)
+            field_type = field.to.pk_type()
+        else:
+            field_type = field.__type__
+        if field.nullable and not field.primary_key:
+            field_type = Optional[field_type]  # type: ignore
+        row_fields.append((field.name, field.get_alias(), field_type))
+    return row_fields
+
+
+def ormar_model_to_row_type(model: Type[Model]) -> Type[Tuple]:
+    """
+    Creates lightweight read-only NamedTuple row class for given ormar model.
+
+    Relations are represented by primary key value of related model,
+    reverse and many to many relations are skipped.
+    Use `records_to_rows` to populate it from `databases` records.
+    """
+    row_fields = _row_fields(model)
+    row_type = NamedTuple(  # type: ignore
+        f"{model.get_name(lower=False)}Row",
+        [(name, field_type) for name, _, field_type in row_fields],
+    )
+    row_type._columns = tuple(alias for _, alias, _ in row_fields)  # type: ignore
+    return cast(Type[Tuple], row_type)
+
+
+def records_to_rows(row_type: Type[Tuple], records: Iterable[Any]) -> List[Tuple]:
+    """
+    Maps `databases` records (i.e. from `Model.Meta.table.select()`)
+    to row classes without pydantic validation.
+    """
+    columns = row_type._columns  # type: ignore
+    make = row_type._make  # type: ignore
+    return [make([record[column] for column in columns]) for record in records]
+
+
+def _type_str_repr(field_type: Any) -> str:
+    if getattr(field_type, "__origin__", None) is not None:
+        args = [x for x in field_type.__args__ if x is not type(None)]  # noqa: E721
+        return f"Optional[{_type_str_repr(args[0])}]"
+    if field_type.__module__ == "builtins":
+        return field_type.__qualname__
+    return f"{field_type.__module__}.{field_type.__qualname__}"
+
+
+def ormar_row_type_str_repr(model: Type[ormar.Model]) -> str:
+    """
+    Returns source code of NamedTuple row class for given ormar model,
+    matching the class created by `ormar_model_to_row_type`.
+
+    Definition expects `NamedTuple` and `Optional` from `typing` and modules
+    of non builtin field types (i.e. `decimal`, `datetime`) to be imported.
+    """
+    pad = "    "
+    row_fields = _row_fields(model)
+    columns = tuple(alias for _, alias, _ in row_fields)
+    definition = (
+        f"\n"
+        f"class {model.get_name(lower=False)}Row(NamedTuple):\n"
+        f"{pad}_columns = {columns!r}\n"
+        f"\n"
+    )
+    for name, _, field_type in row_fields:
+        definition += f"{pad}{name}: {_type_str_repr(field_type)}\n"
+    return definition
@@ -0,0 +1,61 @@
+import asyncio
+import functools
+from typing import Collection, Dict, Type
+
+from databases import Database
+from ormar import Model
+from sqlalchemy import MetaData
+
+from sqlalchemy_to_ormar.main import sqlalchemy_base_to_ormar
+
+
+async def prepare(
+    base: Type,
+    *,
+    metadata: MetaData,
+    database: Database,
+    projections: Dict[str, Dict[str, Collection[str]]] = None,
+    warm_connections: int = 0,
+) -> Dict[str, Type[Model]]:
+    """
+    Converts all models from sqlalchemy declarative base in a worker thread
+    while connecting the database at the same time.
+
+    With `warm_connections` given number of connections is opened upfront.
+    If connecting fails the conversion is still awaited before the error is raised,
+    if the conversion fails the database is disconnected again (when it was
+    connected by this helper).
+
+    Returns dictionary of model name -> ormar Model.
+    """
+    # get_running_loop is not available in python 3.6
+    loop = getattr(asyncio, "get_running_loop", asyncio.get_event_loop)()
+    conversion = loop.run_in_executor(
+        None,
+        functools.partial(
+            sqlalchemy_base_to_ormar,
+            base,
+            metadata=metadata,
+            database=database,
+            projections=projections,
+        ),
+    )
+    opened = False
+    try:
+        if not database.is_connected:
+            await database.connect()
+            opened = True
+        await asyncio.gather(
+            *(_open_connection(database) for _ in range(warm_connections))
+        )
+        return await conversion
+    except BaseException:
+        await asyncio.gather(conversion, return_exceptions=True)
+        if opened:
+            await database.disconnect()
+        raise
+
+
+async def _open_connection(database: Database) -> None:
+    async with database.connection() as connection:
+        await connection.execute("SELECT 1")
@@ -79,7 +79,7 @@ def test_string_repr():
     )
     assert (
         '    user = ormar.ForeignKey(to=User, related_name="addresses", '
-        "name=user_id, nullable=True)" in address_str
+        'name="user_id", nullable=True)' in address_str
     )
 
     user_str = ormar_model_str_repr(OrmarUser, skip_names_if_match=True)
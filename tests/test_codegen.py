@@ -0,0 +1,248 @@
+import re
+import sys
+
+from databases import Database
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    UniqueConstraint,
+    create_engine,
+)
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
+
+from sqlalchemy_to_ormar import (
+    ormar_model_str_repr,
+    ormar_models_module_str_repr,
+    ormar_models_package_str_repr,
+    sqlalchemy_base_to_ormar,
+    sqlalchemy_to_ormar,
+)
+
+Base = declarative_base()
+Database_URL = "sqlite:///test.db"
+engine = create_engine(Database_URL)
+
+database = Database(Database_URL)
+metadata = MetaData(engine)
+
+association_table = Table(
+    "user_group",
+    Base.metadata,
+    Column("id", Integer, primary_key=True),
+    Column("user", Integer, ForeignKey("user.id")),
+    Column("group", Integer, ForeignKey("group.id")),
+)
+
+
+class User(Base):
+    __tablename__ = "user"
+    __table_args__ = (
+        UniqueConstraint("nickname", "email"),
+        UniqueConstraint("email", "name"),
+    )
+    nickname = Column(String(50))
+    id = Column(Integer(), primary_key=True)
+    name = Column(String(255))
+    email = Column(String(255))
+    customer_id = Column(ForeignKey("customer.id"))
+    parent_id = Column(ForeignKey("user.id"))
+    customer = relationship("Customer", primaryjoin="User.customer_id == Customer.id")
+    parent = relationship("User", remote_side=[id])
+    groups = relationship("Group", secondary=association_table)
+
+
+class Customer(Base):
+    __tablename__ = "customer"
+
+    id = Column(Integer(), primary_key=True)
+    name = Column(String(60))
+    seller_id = Column(ForeignKey("user.id"))
+    seller = relationship("User", primaryjoin="Customer.seller_id == User.id")
+
+
+class Group(Base):
+    __tablename__ = "group"
+
+    id = Column(Integer(), primary_key=True)
+    name = Column(String(60))
+
+
+def test_model_str_repr_is_sorted():
+    OrmarUser = sqlalchemy_to_ormar(User, database=database, metadata=metadata)
+    user_str = ormar_model_str_repr(OrmarUser)
+    names = re.findall(r"^    (\w+) = ormar", user_str, flags=re.MULTILINE)
+    assert names == ["id", "customer", "email", "groups", "name", "nickname", "parent"]
+    assert (
+        'constraints=[ormar.UniqueColumns("email", "name"), '
+        'ormar.UniqueColumns("nickname", "email")]' in user_str
+    )
+
+
+def test_module_str_repr():
+    OrmarUser = sqlalchemy_to_ormar(User, database=database, metadata=metadata)
+    OrmarCustomer = sqlalchemy_to_ormar(Customer, database=database, metadata=metadata)
+    OrmarGroup = sqlalchemy_to_ormar(Group, database=database, metadata=metadata)
+
+    module_str = ormar_models_module_str_repr(
+        [OrmarUser, OrmarGroup, OrmarCustomer], preamble="from db import metadata"
+    )
+    assert module_str == ormar_models_module_str_repr(
+        [OrmarCustomer, OrmarGroup, OrmarUser], preamble="from db import metadata"
+    )
+    assert module_str.startswith(
+        "import ormar\n"
+        "from pydantic.typing import ForwardRef\n"
+        "\n"
+        "from db import metadata\n"
+    )
+    classes = re.findall(r"^class (\w+)", module_str, flags=re.MULTILINE)
+    assert classes == ["User_Group", "Group", "Customer", "User"]
+    assert len(re.findall(r"^# content-hash: \w{16}$", module_str, re.MULTILINE)) == 4
+    assert 'customer = ormar.ForeignKey(to=ForwardRef("Customer")' in module_str
+    assert 'seller = ormar.ForeignKey(to=ForwardRef("User")' in module_str
+    assert "groups = ormar.ManyToMany(to=Group" in module_str
+    assert 'parent = ormar.ForeignKey(to=ForwardRef("User")' in module_str
+    assert module_str.endswith(
+        "\nUser.update_forward_refs(Customer=Customer, User=User)\n"
+        "Customer.update_forward_refs(User=User)\n"
+    )
+
+
+def test_content_hash_is_stable_for_unchanged_models():
+    OrmarUser = sqlalchemy_to_ormar(User, database=database, metadata=metadata)
+    OrmarGroup = sqlalchemy_to_ormar(Group, database=database, metadata=metadata)
+
+    hashes = re.findall(
+        r"^# content-hash: (\w+)\nclass (\w+)",
+        ormar_models_module_str_repr([OrmarGroup, OrmarUser]),
+        flags=re.MULTILINE,
+    )
+    group_only_hashes = re.findall(
+        r"^# content-hash: (\w+)\nclass (\w+)",
+        ormar_models_module_str_repr([OrmarGroup]),
+        flags=re.MULTILINE,
+    )
+    assert [x for x in hashes if x[1] == "Group"] == group_only_hashes
+
+
+def test_package_str_repr(tmp_path, monkeypatch):
+    OrmarUser = sqlalchemy_to_ormar(User, database=database, metadata=metadata)
+    OrmarCustomer = sqlalchemy_to_ormar(Customer, database=database, metadata=metadata)
+    OrmarGroup = sqlalchemy_to_ormar(Group, database=database, metadata=metadata)
+
+    package = ormar_models_package_str_repr(
+        [OrmarUser, OrmarGroup, OrmarCustomer],
+        preamble="from generated_db import database, metadata",
+    )
+    assert list(package) == ["__init__.py", "customer_906e9799.py", "group.py"]
+    assert "from .group import Group" in package["customer_906e9799.py"]
+    assert "class User_Group(ormar.Model):" in package["customer_906e9799.py"]
+    assert '    "User_Group": "customer_906e9799",' in package["__init__.py"]
+
+    (tmp_path / "generated_db.py").write_text(
+        "import databases\n"
+        "import sqlalchemy\n"
+        "database = databases.Database('sqlite:///test.db')\n"
+        "metadata = sqlalchemy.MetaData()\n"
+    )
+    package_dir = tmp_path / "generated_models"
+    package_dir.mkdir()
+    for file_name, source in package.items():
+        (package_dir / file_name).write_text(source)
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    import generated_models  # type: ignore # noqa: I100
+
+    assert "generated_models.group" not in sys.modules
+    GeneratedGroup = generated_models.Group
+    assert "generated_models.group" in sys.modules
+    assert "generated_models.customer_906e9799" not in sys.modules
+    assert GeneratedGroup.Meta.tablename == "group"
+
+    GeneratedUser = generated_models.User
+    assert GeneratedUser.Meta.model_fields["groups"].to is GeneratedGroup
+    assert GeneratedUser.Meta.model_fields["parent"].to is GeneratedUser
+    assert set(GeneratedUser.Meta.table.columns.keys()) == {
+        "id",
+        "customer_id",
+        "email",
+        "name",
+        "nickname",
+        "parent_id",
+    }
+
+
+def test_package_module_names_are_bounded_and_unique():
+    RingBase = declarative_base()
+    size = 50
+    # declarative registry keeps only weak references to classes
+    db_models = [
+        type(
+            f"Ring{index:02}",
+            (RingBase,),
+            {
+                "__tablename__": f"ring{index:02}",
+                "id": Column(Integer, primary_key=True),
+                "next_id": Column(
+                    Integer, ForeignKey(f"ring{(index + 1) % size:02}.id")
+                ),
+                "next": relationship(f"Ring{(index + 1) % size:02}"),
+            },
+        )
+        for index in range(size)
+    ]
+    for name in ("Label", "LABEL"):
+        db_models.append(
+            type(
+                name,
+                (RingBase,),
+                {
+                    "__tablename__": name,
+                    "id": Column(Integer, primary_key=True),
+                },
+            )
+        )
+    models = sqlalchemy_base_to_ormar(RingBase, database=database, metadata=MetaData())
+
+    package = ormar_models_package_str_repr(models.values())
+    assert list(package) == [
+        "__init__.py",
+        "label.py",
+        "label_0e66373f.py",
+        "ring00_b63b6e61.py",
+    ]
+    assert '    "LABEL": "label",' in package["__init__.py"]
+    assert '    "Label": "label_0e66373f",' in package["__init__.py"]
+
+
+def test_package_module_names_are_not_keywords():
+    KeywordBase = declarative_base()
+    db_models = [
+        type(name, (KeywordBase,), {"__tablename__": name.lower() + "s", **columns})
+        for name, columns in (
+            (
+                "Class",
+                {
+                    "id": Column(Integer, primary_key=True),
+                    "import_id": Column(Integer, ForeignKey("imports.id")),
+                    "import_": relationship("Import"),
+                },
+            ),
+            ("Import", {"id": Column(Integer, primary_key=True)}),
+        )
+    ]
+    models = sqlalchemy_base_to_ormar(
+        KeywordBase, database=database, metadata=MetaData()
+    )
+
+    package = ormar_models_package_str_repr(models.values())
+    assert len(db_models) == len(package) - 1
+    assert "class.py" not in package
+    assert "import.py" not in package
+    for file_name, source in package.items():
+        compile(source, file_name, "exec")
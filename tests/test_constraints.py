@@ -71,7 +71,7 @@ def test_str_repr():
     assert (
         'user = ormar.ForeignKey(to=User, related_name="addresses", '
         'onupdate="CASCADE", ondelete="CASCADE", '
-        "name=user_id, nullable=True)" in address_str
+        'name="user_id", nullable=True)' in address_str
     )
 
     assert 'constraints=[ormar.UniqueColumns("name", "fullname")]' in user_str
@@ -0,0 +1,184 @@
+import datetime
+import decimal
+import enum
+import uuid
+
+import pytest
+import sqlalchemy
+from databases import Database
+from sqlalchemy import (
+    Column,
+    DECIMAL,
+    DateTime,
+    Integer,
+    MetaData,
+    Sequence,
+    String,
+    create_engine,
+    func,
+    literal,
+    literal_column,
+    text,
+)
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.sql.functions import next_value
+
+from sqlalchemy_to_ormar import (
+    ormar_model_str_repr,
+    ormar_models_module_str_repr,
+    sqlalchemy_to_ormar,
+)
+
+Base = declarative_base()
+Database_URL = "sqlite:///test.db"
+engine = create_engine(Database_URL)
+
+database = Database(Database_URL)
+metadata = MetaData(engine)
+
+
+def default_name():
+    return "default name"
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(100), default=default_name)
+    quantity = Column(Integer, default=0)
+    price = Column(DECIMAL(10, 2), default=decimal.Decimal("1.50"))
+    created = Column(DateTime, default=func.now())
+    updated = Column(DateTime, server_default=func.now())
+    status = Column(String(20), server_default="new")
+    kind = Column(String(20), server_default=text("'basic'"))
+    context_dependent = Column(Integer, default=lambda ctx: 1)
+
+
+# only translated and rendered, sequences are not supported by sqlite
+class Extra(Base):
+    __tablename__ = "extras"
+
+    id = Column(Integer, primary_key=True)
+    counter = Column(Integer, Sequence("extras_counter_seq"))
+    total = Column(Integer, default=literal(5) + 1)
+    fallback = Column(Integer, server_default=func.coalesce(literal_column("x"), 0))
+    clock = Column(String(10), server_default=text("'12:30'"))
+    color = Column(String(10), default=Color.RED)
+    token = Column(String(36), default=uuid.UUID(int=1))
+    opaque = Column(String(10), default=object())
+
+
+@pytest.fixture(autouse=True, scope="module")
+def create_test_database():
+    with pytest.warns(UserWarning, match=r"items\.context_dependent \(callable"):
+        sqlalchemy_to_ormar(Item, database=database, metadata=metadata)
+    metadata.create_all(engine)
+    yield
+    metadata.drop_all(engine)
+
+
+def test_defaults_are_translated():
+    OrmarItem = sqlalchemy_to_ormar(Item, database=database, metadata=metadata)
+    fields = OrmarItem.Meta.model_fields
+
+    assert fields["name"].ormar_default is default_name
+    assert fields["quantity"].ormar_default == 0
+    assert fields["price"].ormar_default == decimal.Decimal("1.50")
+    assert fields["context_dependent"].ormar_default is None
+
+    assert fields["created"].ormar_default is None
+    assert str(fields["created"].server_default) == "now()"
+    assert str(fields["updated"].server_default) == "now()"
+    assert fields["status"].server_default == "new"
+    assert fields["kind"].server_default.text == "'basic'"
+
+
+def test_primary_key_sequence_is_skipped_with_warning():
+    OtherBase = declarative_base()
+
+    class Ticket(OtherBase):
+        __tablename__ = "tickets"
+        id = Column(Integer, Sequence("tickets_id_seq"), primary_key=True)
+
+    with pytest.warns(UserWarning, match=r"tickets\.id \(sequence of primary key\)"):
+        OrmarTicket = sqlalchemy_to_ormar(
+            Ticket, database=database, metadata=MetaData()
+        )
+    assert OrmarTicket.Meta.model_fields["id"].server_default is None
+
+
+def test_sequence_is_translated():
+    OrmarExtra = sqlalchemy_to_ormar(Extra, database=database, metadata=MetaData())
+    server_default = OrmarExtra.Meta.model_fields["counter"].server_default
+
+    assert isinstance(server_default, next_value)
+    assert server_default.sequence.name == "extras_counter_seq"
+
+
+@pytest.mark.asyncio
+async def test_defaults_are_applied():
+    OrmarItem = sqlalchemy_to_ormar(Item, database=database, metadata=metadata)
+    async with database:
+        item = await OrmarItem.objects.create()
+        item = await OrmarItem.objects.get(pk=item.pk)
+    assert item.name == "default name"
+    assert item.quantity == 0
+    assert item.status == "new"
+    assert item.kind == "basic"
+    assert isinstance(item.created, datetime.datetime)
+    assert isinstance(item.updated, datetime.datetime)
+
+
+def test_defaults_str_repr():
+    OrmarItem = sqlalchemy_to_ormar(Item, database=database, metadata=metadata)
+    item_str = ormar_model_str_repr(OrmarItem)
+
+    assert "default=tests.test_defaults.default_name" in item_str
+    assert "default=0" in item_str
+    assert "default=decimal.Decimal('1.50')" in item_str
+    assert "server_default=sqlalchemy.func.now()" in item_str
+    assert 'server_default="new"' in item_str
+    assert "server_default=sqlalchemy.text(\"'basic'\")" in item_str
+    assert "context_dependent = ormar.Integer(nullable=True)" in item_str
+
+    module_str = ormar_models_module_str_repr([OrmarItem])
+    assert module_str.startswith(
+        "import decimal\nimport ormar\nimport sqlalchemy\nimport tests.test_defaults\n"
+    )
+    namespace = {"database": database, "metadata": sqlalchemy.MetaData()}
+    exec(module_str, namespace)  # noqa: S102
+    table = namespace["Item"].Meta.table
+    assert str(table.c.updated.server_default.arg) == "now()"
+    assert table.c.name.default.arg.__wrapped__ is default_name
+
+
+def test_expression_and_object_defaults_str_repr():
+    OrmarExtra = sqlalchemy_to_ormar(Extra, database=database, metadata=MetaData())
+    extra_str = ormar_model_str_repr(OrmarExtra)
+
+    assert (
+        'server_default=sqlalchemy.Sequence("extras_counter_seq").next_value()'
+        in extra_str
+    )
+    assert "server_default=sqlalchemy.text('5 + 1')" in extra_str
+    assert "server_default=sqlalchemy.text('coalesce(x, 0)')" in extra_str
+    assert "server_default=sqlalchemy.text(\"'12\\\\:30'\")" in extra_str
+    assert "default=tests.test_defaults.Color.RED" in extra_str
+    assert "default=uuid.UUID('00000000-0000-0000-0000-000000000001')" in extra_str
+    assert "opaque = ormar.String(max_length=10, nullable=True)" in extra_str
+
+    module_str = ormar_models_module_str_repr([OrmarExtra])
+    assert module_str.startswith(
+        "import ormar\nimport sqlalchemy\nimport tests.test_defaults\nimport uuid\n"
+    )
+    namespace = {"database": database, "metadata": sqlalchemy.MetaData()}
+    exec(module_str, namespace)  # noqa: S102
+    table = namespace["Extra"].Meta.table
+    assert str(table.c.total.server_default.arg) == "5 + 1"
+    assert str(table.c.clock.server_default.arg) == "'12:30'"
+    assert table.c.color.default.arg is Color.RED
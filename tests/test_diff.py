@@ -0,0 +1,180 @@
+import json
+import os
+import subprocess
+import sys
+
+from databases import Database
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
+
+from sqlalchemy_to_ormar import diff_schemas, schema_spec, sqlalchemy_base_to_ormar
+from sqlalchemy_to_ormar.diff import main
+
+database = Database("sqlite:///test.db")
+
+
+def build_old_base():
+    Base = declarative_base()
+
+    class User(Base):
+        __tablename__ = "users"
+
+        id = Column(Integer, primary_key=True)
+        name = Column(String)
+        fullname = Column(String)
+
+    class Address(Base):
+        __tablename__ = "addresses"
+
+        id = Column(Integer, primary_key=True)
+        email_address = Column(String, nullable=False)
+        user_id = Column(Integer, ForeignKey("users.id"))
+
+        user = relationship("User")
+
+    class Company(Base):
+        __tablename__ = "companies"
+
+        id = Column(Integer, primary_key=True)
+
+    # declarative registry keeps only weak references to models
+    return Base, [User, Address, Company]
+
+
+def build_new_base():
+    Base = declarative_base()
+
+    class User(Base):
+        __tablename__ = "users"
+        __table_args__ = (UniqueConstraint("name", "nickname"),)
+
+        id = Column(Integer, primary_key=True)
+        name = Column(String(100))
+        nickname = Column(String)
+
+    class Address(Base):
+        __tablename__ = "addresses"
+
+        id = Column(Integer, primary_key=True)
+        email_address = Column(String, nullable=False)
+        user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
+
+        user = relationship("User")
+
+    class Country(Base):
+        __tablename__ = "countries"
+
+        id = Column(Integer, primary_key=True)
+
+    return Base, [User, Address, Country]
+
+
+OldBase, old_models = build_old_base()
+NewBase, new_models = build_new_base()
+
+
+def _spec(base):
+    models = sqlalchemy_base_to_ormar(base, metadata=MetaData(), database=database)
+    return schema_spec(models.values())
+
+
+def test_diff_schemas():
+    old, new = _spec(OldBase), _spec(NewBase)
+    diff = diff_schemas(old, new)
+    assert diff["added"] == ["Country"]
+    assert diff["removed"] == ["Company"]
+    assert sorted(diff["changed"]) == ["Address", "User"]
+
+    user_diff = diff["changed"]["User"]
+    assert user_diff["fields"]["added"] == ["nickname"]
+    assert user_diff["fields"]["removed"] == ["fullname"]
+    assert list(user_diff["fields"]["changed"]) == ["name"]
+    name_diff = user_diff["fields"]["changed"]["name"]
+    assert (name_diff["old"]["max_length"], name_diff["new"]["max_length"]) == (
+        255,
+        100,
+    )
+    assert user_diff["relations"] == {"added": [], "removed": [], "changed": {}}
+    assert user_diff["constraints"] == {"added": [["name", "nickname"]], "removed": []}
+    assert "tablename" not in user_diff
+
+    address_diff = diff["changed"]["Address"]
+    assert address_diff["fields"]["changed"] == {}
+    assert list(address_diff["relations"]["changed"]) == ["user"]
+    user_relation = address_diff["relations"]["changed"]["user"]
+    assert user_relation["old"]["to"] == user_relation["new"]["to"] == "User"
+    assert user_relation["old"]["ondelete"] is None
+    assert user_relation["new"]["ondelete"] == "CASCADE"
+
+    assert diff_schemas(new, new) == {"added": [], "removed": [], "changed": {}}
+
+
+def test_diff_tablename():
+    old, new = _spec(OldBase), _spec(OldBase)
+    new["models"]["Company"]["tablename"] = "firms"
+    new["models"]["Company"]["signature"] = "changed"
+
+    assert diff_schemas(old, new)["changed"]["Company"]["tablename"] == {
+        "old": "companies",
+        "new": "firms",
+    }
+
+
+def test_spec_is_stable():
+    spec = _spec(NewBase)
+    assert json.loads(json.dumps(spec)) == spec
+    assert spec == _spec(NewBase)
+
+
+def test_cli(tmp_path, capsys):
+    spec_file = str(tmp_path / "spec.json")
+    assert main(["tests.test_diff:NewBase", "--dump", spec_file]) == 0
+    capsys.readouterr()
+    assert main([spec_file, "tests.test_diff:OldBase"]) == 1
+    diff = json.loads(capsys.readouterr().out)
+    assert diff["added"] == ["Company"]
+    assert diff["removed"] == ["Country"]
+    address_diff = diff["changed"]["Address"]["relations"]["changed"]["user"]
+    assert address_diff["old"]["ondelete"] == "CASCADE"
+    assert address_diff["new"]["ondelete"] is None
+
+
+def test_cli_imports_base_from_working_directory(tmp_path):
+    project_dir = tmp_path / "project"
+    project_dir.mkdir()
+    (project_dir / "cli_models.py").write_text(
+        "from sqlalchemy import Column, Integer\n"
+        "from sqlalchemy.ext.declarative import declarative_base\n"
+        "Base = declarative_base()\n"
+        "class Tag(Base):\n"
+        "    __tablename__ = 'tags'\n"
+        "    id = Column(Integer, primary_key=True)\n"
+    )
+    # run like a console script, with the script directory on the path
+    # instead of the working directory
+    script_dir = tmp_path / "bin"
+    script_dir.mkdir()
+    script = script_dir / "sqlalchemy-to-ormar-diff"
+    script.write_text(
+        "import sys\n"
+        "from sqlalchemy_to_ormar.diff import main\n"
+        "sys.exit(main())\n"
+    )
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, str(script), "cli_models:Base"],
+        cwd=str(project_dir),
+        env={**os.environ, "PYTHONPATH": root_dir},
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    assert result.returncode == 0
+    assert json.loads(result.stdout) == {"added": [], "removed": [], "changed": {}}
@@ -0,0 +1,372 @@
+import time
+from typing import Any, Dict, List, Tuple, Type
+
+import hypothesis
+import hypothesis.strategies as st
+from databases import Database
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    DECIMAL,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    MetaData,
+    SmallInteger,
+    String,
+    Table,
+    Text,
+    Time,
+    UniqueConstraint,
+    create_engine,
+    inspect,
+)
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import configure_mappers, relationship
+
+from sqlalchemy_to_ormar import ormar_models_module_str_repr, sqlalchemy_base_to_ormar
+
+database = Database("sqlite://")
+
+column_types = st.one_of(
+    st.builds(Integer),
+    st.builds(SmallInteger),
+    st.builds(BigInteger),
+    st.builds(String, st.integers(min_value=1, max_value=255)),
+    st.builds(Text),
+    st.builds(Float),
+    # ormar does not accept decimal_places=0
+    st.integers(min_value=1, max_value=18).flatmap(
+        lambda precision: st.builds(
+            DECIMAL, st.just(precision), st.integers(min_value=1, max_value=precision)
+        )
+    ),
+    st.builds(Date),
+    st.builds(DateTime),
+    st.builds(Time),
+    st.builds(Boolean),
+)
+
+column_specs = st.fixed_dictionaries(
+    {
+        "type": column_types,
+        "nullable": st.booleans(),
+        "index": st.booleans(),
+        "unique": st.booleans(),
+    }
+)
+
+
+@st.composite
+def schemas(draw: Any, max_models: int = 5) -> List[Dict[str, Any]]:
+    """
+    Draws declarative schema spec - a list of model specs with columns,
+    foreign keys (including self references and cycles) and many to many relations.
+    """
+    size = draw(st.integers(min_value=1, max_value=max_models))
+    targets = st.integers(min_value=0, max_value=size - 1)
+    schema = []
+    for index in range(size):
+        columns = draw(st.lists(column_specs, max_size=4))
+        unique_together = (
+            draw(
+                st.lists(
+                    st.integers(min_value=0, max_value=len(columns) - 1),
+                    min_size=2,
+                    max_size=2,
+                    unique=True,
+                )
+            )
+            if len(columns) > 1 and draw(st.booleans())
+            else []
+        )
+        foreign_keys = draw(
+            st.lists(
+                st.fixed_dictionaries(
+                    {
+                        "target": targets,
+                        "nullable": st.booleans(),
+                        "ondelete": st.sampled_from([None, "CASCADE", "SET NULL"]),
+                        "named": st.booleans(),
+                    }
+                ),
+                max_size=3,
+            )
+        )
+        many_to_many = draw(
+            st.lists(
+                st.integers(min_value=index + 1, max_value=size - 1),
+                unique=True,
+                max_size=2,
+            )
+            if index < size - 1
+            else st.just([])
+        )
+        schema.append(
+            {
+                "columns": columns,
+                "unique_together": unique_together,
+                "foreign_keys": foreign_keys,
+                "many_to_many": many_to_many,
+            }
+        )
+    return schema
+
+
+def _relations_count(spec: Dict[str, Any]) -> Dict[int, int]:
+    relations_count: Dict[int, int] = {}
+    for target in [fk["target"] for fk in spec["foreign_keys"]] + spec["many_to_many"]:
+        relations_count[target] = relations_count.get(target, 0) + 1
+    return relations_count
+
+
+def _add_foreign_keys(
+    namespaces: List[Dict[str, Any]], index: int, spec: Dict[str, Any]
+) -> None:
+    namespace = namespaces[index]
+    owner = f"Model{index}"
+    relations_count = _relations_count(spec)
+    for number, fk in enumerate(spec["foreign_keys"]):
+        target = fk["target"]
+        namespace[f"rel{number}_id"] = Column(
+            Integer,
+            ForeignKey(f"model{target}.id", ondelete=fk["ondelete"]),
+            nullable=fk["nullable"],
+        )
+        kwargs: Dict[str, Any] = {"foreign_keys": f"{owner}.rel{number}_id"}
+        if target == index:
+            kwargs["remote_side"] = f"{owner}.id"
+        # ormar requires unique related names, default is the same
+        # for all relations from given model to the same target
+        if fk["named"] or relations_count[target] > 1:
+            related_name = f"model{index}_rel{number}"
+            kwargs["back_populates"] = related_name
+            namespaces[target][related_name] = relationship(
+                owner,
+                foreign_keys=f"{owner}.rel{number}_id",
+                back_populates=f"rel{number}",
+            )
+        namespace[f"rel{number}"] = relationship(f"Model{target}", **kwargs)
+
+
+def _add_many_to_many(
+    namespaces: List[Dict[str, Any]],
+    index: int,
+    spec: Dict[str, Any],
+    metadata: MetaData,
+) -> None:
+    owner = f"Model{index}"
+    relations_count = _relations_count(spec)
+    for target in spec["many_to_many"]:
+        # ormar through models always cascade
+        through = Table(
+            f"model{index}_model{target}",
+            metadata,
+            Column("id", Integer, primary_key=True),
+            *[
+                Column(
+                    f"model{x}",
+                    Integer,
+                    ForeignKey(f"model{x}.id", ondelete="CASCADE"),
+                )
+                for x in (index, target)
+            ],
+        )
+        kwargs: Dict[str, Any] = {"secondary": through}
+        if relations_count[target] > 1:
+            related_name = f"model{index}_m2m{target}"
+            kwargs["back_populates"] = related_name
+            namespaces[target][related_name] = relationship(
+                owner, secondary=through, back_populates=f"m2m{target}"
+            )
+        namespaces[index][f"m2m{target}"] = relationship(f"Model{target}", **kwargs)
+
+
+def build_base(schema: List[Dict[str, Any]]) -> Tuple[Type, List[Type]]:
+    Base = declarative_base()
+    namespaces: List[Dict[str, Any]] = [
+        {"__tablename__": f"model{index}", "id": Column(Integer, primary_key=True)}
+        for index in range(len(schema))
+    ]
+    for index, spec in enumerate(schema):
+        namespace = namespaces[index]
+        for number, column in enumerate(spec["columns"]):
+            namespace[f"col{number}"] = Column(
+                column["type"],
+                nullable=column["nullable"],
+                index=column["index"],
+                unique=column["unique"],
+            )
+        if spec["unique_together"]:
+            namespace["__table_args__"] = (
+                UniqueConstraint(*[f"col{x}" for x in spec["unique_together"]]),
+            )
+        _add_foreign_keys(namespaces, index, spec)
+        _add_many_to_many(namespaces, index, spec, Base.metadata)
+    db_models = [
+        type(f"Model{index}", (Base,), namespace)
+        for index, namespace in enumerate(namespaces)
+    ]
+    configure_mappers()
+    return Base, db_models
+
+
+def _type_signature(column_type: Any) -> Tuple:
+    return (
+        column_type.python_type,
+        getattr(column_type, "length", None),
+        getattr(column_type, "precision", None),
+        getattr(column_type, "scale", None),
+    )
+
+
+def database_schema(metadata: MetaData) -> Dict[str, Dict[str, Any]]:
+    """
+    Creates tables in a new sqlite database and reflects them back.
+    """
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    inspector = inspect(engine)
+    return {
+        table: {
+            "columns": {
+                column["name"]: (
+                    _type_signature(column["type"]),
+                    column["nullable"],
+                    column["primary_key"],
+                    column["default"],
+                )
+                for column in inspector.get_columns(table)
+            },
+            "foreign_keys": sorted(
+                (
+                    tuple(fk["constrained_columns"]),
+                    fk["referred_table"],
+                    tuple(fk["referred_columns"]),
+                    fk["options"].get("ondelete"),
+                )
+                for fk in inspector.get_foreign_keys(table)
+            ),
+            "indexes": sorted(
+                (tuple(index["column_names"]), bool(index["unique"]))
+                for index in inspector.get_indexes(table)
+            ),
+            "unique": sorted(
+                tuple(constraint["column_names"])
+                for constraint in inspector.get_unique_constraints(table)
+            ),
+        }
+        for table in inspector.get_table_names()
+    }
+
+
+def models_metadata(models: Any) -> MetaData:
+    metadata = MetaData()
+    for model in models:
+        tables = [model.Meta.table] + [
+            field.through.Meta.table
+            for field in model.Meta.model_fields.values()
+            if field.is_multi
+        ]
+        for table in tables:
+            if table.key not in metadata.tables:
+                table.tometadata(metadata)
+    return metadata
+
+
+@hypothesis.settings(
+    max_examples=30,
+    deadline=None,
+    suppress_health_check=[hypothesis.HealthCheck.too_slow],
+)
+@hypothesis.given(schema=schemas())
+@hypothesis.example(
+    # relation to model already converted as many to many target
+    schema=[
+        {"columns": [], "unique_together": [], "foreign_keys": [], "many_to_many": [2]},
+        {
+            "columns": [],
+            "unique_together": [],
+            "foreign_keys": [
+                {"target": 2, "nullable": False, "ondelete": None, "named": False}
+            ],
+            "many_to_many": [],
+        },
+        {"columns": [], "unique_together": [], "foreign_keys": [], "many_to_many": []},
+    ]
+)
+@hypothesis.example(
+    # many to many declared on both sides while models are converted
+    schema=[
+        {
+            "columns": [],
+            "unique_together": [],
+            "foreign_keys": [
+                {"target": 1, "nullable": True, "ondelete": None, "named": False}
+            ],
+            "many_to_many": [1],
+        },
+        {"columns": [], "unique_together": [], "foreign_keys": [], "many_to_many": []},
+    ]
+)
+def test_random_schemas_round_trip(schema):
+    Base, db_models = build_base(schema)
+    expected = database_schema(Base.metadata)
+
+    start = time.perf_counter()
+    models = sqlalchemy_base_to_ormar(Base, metadata=MetaData(), database=database)
+    elapsed = time.perf_counter() - start
+    hypothesis.event(f"models: {len(schema)}")
+    hypothesis.target(elapsed / len(schema), label="conversion seconds per model")
+    assert database_schema(models_metadata(models.values())) == expected
+
+    module_str = ormar_models_module_str_repr(models.values())
+    namespace = {"database": database, "metadata": MetaData()}
+    exec(module_str, namespace)  # noqa: S102
+    generated = [namespace[name] for name in models]
+    assert database_schema(models_metadata(generated)) == expected
+
+
+def chain_schema(size: int) -> List[Dict[str, Any]]:
+    column = {"type": String(100), "nullable": True, "index": False, "unique": False}
+    return [
+        {
+            "columns": [column] * 3,
+            "unique_together": [],
+            "foreign_keys": [
+                {
+                    "target": (index + 1) % size,
+                    "nullable": True,
+                    "ondelete": None,
+                    "named": False,
+                }
+            ]
+            if size > 1
+            else [],
+            "many_to_many": [],
+        }
+        for index in range(size)
+    ]
+
+
+def test_conversion_time_per_schema_size(record_property):
+    # raw timings depend on the machine, so they are only recorded (i.e. in junit
+    # xml) and the check compares how time per model grows with schema size
+    per_model = {}
+    for size in (5, 10, 20, 40):
+        timings = []
+        for _ in range(3):
+            Base, _ = build_base(chain_schema(size))
+            start = time.perf_counter()
+            models = sqlalchemy_base_to_ormar(
+                Base, metadata=MetaData(), database=database
+            )
+            timings.append(time.perf_counter() - start)
+            assert len(models) == size
+        per_model[size] = min(timings) / size
+        record_property(f"conversion_seconds_per_model_{size}", per_model[size])
+    # conversion scales (close to) linearly with the number of models
+    assert per_model[40] < per_model[5] * 3
@@ -0,0 +1,134 @@
+import gc
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+import typing
+
+from databases import Database
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, String, Table
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
+
+from sqlalchemy_to_ormar import conversion_memory_report, sqlalchemy_base_to_ormar
+from sqlalchemy_to_ormar.maps import PARSED_MODELS
+
+
+def build_base():
+    Base = declarative_base()
+
+    association_table = Table(
+        "association",
+        Base.metadata,
+        Column("id", Integer, primary_key=True),
+        Column("user", Integer, ForeignKey("users.id")),
+        Column("group", Integer, ForeignKey("groups.id")),
+    )
+
+    class User(Base):
+        __tablename__ = "users"
+        id = Column(Integer, primary_key=True)
+        name = Column(String)
+        main_address_id = Column(Integer, ForeignKey("addresses.id"))
+        groups = relationship("Group", secondary=association_table)
+        main_address = relationship("Address", foreign_keys=[main_address_id])
+
+    class Address(Base):
+        __tablename__ = "addresses"
+        id = Column(Integer, primary_key=True)
+        user_id = Column(Integer, ForeignKey("users.id"))
+        user = relationship("User", foreign_keys=[user_id])
+
+    class Group(Base):
+        __tablename__ = "groups"
+        id = Column(Integer, primary_key=True)
+
+    return Base, [User, Address, Group]
+
+
+def convert():
+    Base, _ = build_base()
+    return sqlalchemy_base_to_ormar(
+        Base, metadata=MetaData(), database=Database("sqlite:///test.db")
+    )
+
+
+def test_memory_report():
+    Base, _ = build_base()
+    report = conversion_memory_report(
+        Base, metadata=MetaData(), database=Database("sqlite:///test.db")
+    )
+    assert list(report["models"]) == ["Address", "Group", "User"]
+    assert report["models"]["Group"]["models"] == ["Group"]
+    assert report["models"]["Group"]["tables"] == ["groups"]
+    # models with circular relations are converted together
+    assert report["models"]["Address"] is report["models"]["User"]
+    assert report["models"]["User"]["models"] == ["Address", "User"]
+    assert report["models"]["User"]["tables"] == ["addresses", "association", "users"]
+    assert all(x["bytes"] > 0 for x in report["models"].values())
+    assert report["total"] >= (
+        report["models"]["Group"]["bytes"] + report["models"]["User"]["bytes"]
+    )
+    assert not tracemalloc.is_tracing()
+
+
+def flush_typing_caches():
+    # typing caches recently subscribed types (i.e. Optional[Model]),
+    # fill them with throwaway classes so discarded models can be released
+    for _ in range(256):
+        flush = type("Flush", (), {})
+        typing.Optional[flush]
+        typing.List[flush]
+        typing.Type[flush]
+
+
+def convert_and_discard(times):
+    for _ in range(times):
+        convert()
+        gc.collect()
+    flush_typing_caches()
+    gc.collect()
+
+
+def measure_retained_memory():
+    tracemalloc.start()
+    try:
+        # warm up internal sqlalchemy/ormar registries
+        convert_and_discard(10)
+        models_count = len(PARSED_MODELS)
+        baseline = tracemalloc.get_traced_memory()[0]
+        models = convert()
+        gc.collect()
+        single_conversion = tracemalloc.get_traced_memory()[0] - baseline
+        del models
+        convert_and_discard(10)
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    return {
+        "models_count_change": len(PARSED_MODELS) - models_count,
+        "single_conversion": single_conversion,
+        "retained": retained,
+    }
+
+
+def test_memory_returns_to_baseline():
+    # measure in a new interpreter, as global sqlalchemy and pydantic
+    # registries grown by other tests skew the result
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import json; from tests.test_memory import measure_retained_memory; "
+            "print(json.dumps(measure_retained_memory()))",
+        ],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    measurement = json.loads(result.stdout.splitlines()[-1])
+    assert measurement["models_count_change"] == 0
+    # ten discarded conversions retain only a fraction of a single live one
+    assert measurement["retained"] < measurement["single_conversion"] * 0.25
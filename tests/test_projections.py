@@ -0,0 +1,141 @@
+import warnings
+
+import pytest
+from databases import Database
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Integer,
+    LargeBinary,
+    MetaData,
+    String,
+    UniqueConstraint,
+    create_engine,
+)
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
+
+from sqlalchemy_to_ormar import (
+    ormar_model_str_repr,
+    sqlalchemy_base_to_ormar,
+    sqlalchemy_to_ormar,
+)
+
+Base = declarative_base()
+Database_URL = "sqlite:///test.db"
+engine = create_engine(Database_URL)
+
+database = Database(Database_URL)
+metadata = MetaData(engine)
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    fullname = Column(String)
+    audit_blob = Column(LargeBinary)
+
+    addresses = relationship("Address", back_populates="user")
+
+
+class Address(Base):
+    __tablename__ = "addresses"
+    id = Column(Integer, primary_key=True)
+    email_address = Column(String, nullable=False)
+    audit_blob = Column(LargeBinary)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    company_id = Column(Integer, ForeignKey("companies.id"))
+
+    user = relationship("User", back_populates="addresses")
+    company = relationship("Company")
+
+
+class Company(Base):
+    __tablename__ = "companies"
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+
+def test_projections_are_applied_during_recursion():
+    OrmarAddress = sqlalchemy_to_ormar(
+        Address,
+        database=database,
+        metadata=metadata,
+        exclude=["company"],
+        projections={"User": {"include": ["name"]}, "*": {"exclude": ["audit_blob"]}},
+    )
+    OrmarUser = sqlalchemy_to_ormar(User, database=database, metadata=metadata)
+
+    assert set(OrmarAddress.Meta.model_fields) == {"id", "email_address", "user"}
+    assert set(OrmarUser.Meta.model_fields) == {"id", "name", "addresses"}
+    assert OrmarAddress.extract_related_names() == {"user"}
+
+    address_str = ormar_model_str_repr(OrmarAddress)
+    user_str = ormar_model_str_repr(OrmarUser)
+    assert "audit_blob" not in address_str
+    assert "company" not in address_str
+    assert "fullname" not in user_str
+    assert "    name = ormar.String(max_length=255, nullable=True)" in user_str
+
+
+def test_projections_of_converted_model_are_ignored_with_warning():
+    OrmarCompany = sqlalchemy_to_ormar(Company, database=database, metadata=metadata)
+
+    with pytest.warns(UserWarning, match="Company is already converted"):
+        assert (
+            sqlalchemy_to_ormar(
+                Company, database=database, metadata=metadata, exclude=["name"]
+            )
+            is OrmarCompany
+        )
+
+
+def test_base_projections_do_not_warn_for_models_converted_during_call():
+    OtherBase = declarative_base()
+
+    class Owner(OtherBase):
+        __tablename__ = "owners"
+        id = Column(Integer, primary_key=True)
+        audit_blob = Column(LargeBinary)
+
+    class Animal(OtherBase):
+        __tablename__ = "animals"
+        id = Column(Integer, primary_key=True)
+        owner_id = Column(Integer, ForeignKey("owners.id"))
+        owner = relationship("Owner")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        models = sqlalchemy_base_to_ormar(
+            OtherBase,
+            database=database,
+            metadata=MetaData(),
+            projections={"*": {"exclude": ["audit_blob"]}},
+        )
+    assert set(models["Owner"].Meta.model_fields) == {"id", "animals"}
+
+
+def test_unique_constraint_with_excluded_column_is_skipped():
+    OtherBase = declarative_base()
+
+    class Person(OtherBase):
+        __tablename__ = "persons"
+        __table_args__ = (
+            UniqueConstraint("name", "fullname"),
+            UniqueConstraint("name", "nickname"),
+        )
+        id = Column(Integer, primary_key=True)
+        name = Column(String)
+        fullname = Column(String)
+        nickname = Column(String)
+
+    OrmarPerson = sqlalchemy_to_ormar(
+        Person, database=database, metadata=MetaData(), exclude=["fullname"]
+    )
+
+    assert set(OrmarPerson.Meta.model_fields) == {"id", "name", "nickname"}
+    assert [list(x._pending_colargs) for x in OrmarPerson.Meta.constraints] == [
+        ["name", "nickname"]
+    ]
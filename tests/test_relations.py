@@ -0,0 +1,222 @@
+import pytest
+from databases import Database
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Integer,
+    LargeBinary,
+    MetaData,
+    String,
+    Table,
+)
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
+
+from sqlalchemy_to_ormar import sqlalchemy_to_ormar
+from sqlalchemy_to_ormar.maps import (
+    CURRENTLY_PROCESSED,
+    FORWARD_REF_WAITERS,
+    PARSED_MODELS,
+)
+
+database = Database("sqlite:///test.db")
+
+
+def test_relation_to_already_converted_model():
+    Base = declarative_base()
+
+    class Tag(Base):
+        __tablename__ = "tags"
+        id = Column(Integer, primary_key=True)
+        name = Column(String(50))
+
+    class Post(Base):
+        __tablename__ = "posts"
+        id = Column(Integer, primary_key=True)
+        tag_id = Column(Integer, ForeignKey("tags.id"))
+        tag = relationship("Tag")
+
+    metadata = MetaData()
+    OrmarTag = sqlalchemy_to_ormar(Tag, metadata=metadata, database=database)
+    OrmarPost = sqlalchemy_to_ormar(Post, metadata=metadata, database=database)
+
+    assert OrmarPost.Meta.model_fields["tag"].to is OrmarTag
+    assert OrmarPost.Meta.table.c.tag_id.references(OrmarTag.Meta.table.c.id)
+    assert OrmarTag.extract_related_names() == {"posts"}
+
+
+def test_foreign_key_nullable_follows_column():
+    Base = declarative_base()
+
+    class Author(Base):
+        __tablename__ = "authors"
+        id = Column(Integer, primary_key=True)
+
+    class Book(Base):
+        __tablename__ = "books"
+        id = Column(Integer, primary_key=True)
+        author_id = Column(Integer, ForeignKey("authors.id"), nullable=False)
+        editor_id = Column(Integer, ForeignKey("authors.id"))
+        author = relationship("Author", foreign_keys=[author_id])
+        editor = relationship(
+            "Author", foreign_keys=[editor_id], back_populates="edited_books"
+        )
+
+    Author.edited_books = relationship(
+        "Book", foreign_keys=[Book.editor_id], back_populates="editor"
+    )
+
+    OrmarBook = sqlalchemy_to_ormar(Book, metadata=MetaData(), database=database)
+
+    assert not OrmarBook.Meta.model_fields["author"].nullable
+    assert not OrmarBook.Meta.table.c.author_id.nullable
+    assert OrmarBook.Meta.model_fields["editor"].nullable
+    assert OrmarBook.Meta.table.c.editor_id.nullable
+
+
+def test_many_to_many_declared_on_both_sides_while_converting():
+    Base = declarative_base()
+    enrollments = Table(
+        "enrollments",
+        Base.metadata,
+        Column("id", Integer, primary_key=True),
+        Column("student", Integer, ForeignKey("students.id")),
+        Column("course", Integer, ForeignKey("courses.id")),
+    )
+
+    class Student(Base):
+        __tablename__ = "students"
+        id = Column(Integer, primary_key=True)
+        favourite_id = Column(Integer, ForeignKey("courses.id"))
+        favourite = relationship("Course", back_populates="fans")
+        courses = relationship(
+            "Course", secondary=enrollments, back_populates="students"
+        )
+
+    class Course(Base):
+        __tablename__ = "courses"
+        id = Column(Integer, primary_key=True)
+        fans = relationship("Student", back_populates="favourite")
+        students = relationship(
+            "Student", secondary=enrollments, back_populates="courses"
+        )
+
+    metadata = MetaData()
+    OrmarStudent = sqlalchemy_to_ormar(Student, metadata=metadata, database=database)
+    OrmarCourse = sqlalchemy_to_ormar(Course, metadata=metadata, database=database)
+
+    assert OrmarStudent.extract_related_names() == {"favourite", "courses"}
+    assert OrmarCourse.extract_related_names() == {"fans", "students"}
+    assert OrmarStudent.Meta.model_fields["courses"].to is OrmarCourse
+    assert "enrollments" in metadata.tables
+
+
+def test_many_to_many_of_model_converted_as_target():
+    Base = declarative_base()
+    tables = [
+        Table(
+            f"{left}_{right}",
+            Base.metadata,
+            Column("id", Integer, primary_key=True),
+            Column(left, Integer, ForeignKey(f"{left}.id")),
+            Column(right, Integer, ForeignKey(f"{right}.id")),
+        )
+        for left, right in [("first", "second"), ("second", "third")]
+    ]
+
+    class First(Base):
+        __tablename__ = "first"
+        id = Column(Integer, primary_key=True)
+        seconds = relationship("Second", secondary=tables[0])
+
+    class Second(Base):
+        __tablename__ = "second"
+        id = Column(Integer, primary_key=True)
+        thirds = relationship("Third", secondary=tables[1])
+
+    class Third(Base):
+        __tablename__ = "third"
+        id = Column(Integer, primary_key=True)
+
+    metadata = MetaData()
+    sqlalchemy_to_ormar(First, metadata=metadata, database=database)
+    OrmarSecond = sqlalchemy_to_ormar(Second, metadata=metadata, database=database)
+
+    assert OrmarSecond.extract_related_names() == {"firsts", "thirds"}
+
+
+def test_reverse_parameter_is_deprecated():
+    Base = declarative_base()
+
+    class Note(Base):
+        __tablename__ = "notes"
+        id = Column(Integer, primary_key=True)
+
+    with pytest.warns(DeprecationWarning):
+        sqlalchemy_to_ormar(Note, metadata=MetaData(), database=database, reverse=True)
+
+
+def test_relation_loop_of_three_models():
+    Base = declarative_base()
+
+    class Country(Base):
+        __tablename__ = "countries"
+        id = Column(Integer, primary_key=True)
+        capital_id = Column(Integer, ForeignKey("cities.id"))
+        capital = relationship("City")
+
+    class City(Base):
+        __tablename__ = "cities"
+        id = Column(Integer, primary_key=True)
+        mayor_id = Column(Integer, ForeignKey("people.id"))
+        mayor = relationship("Person")
+
+    class Person(Base):
+        __tablename__ = "people"
+        id = Column(Integer, primary_key=True)
+        country_id = Column(Integer, ForeignKey("countries.id"))
+        country = relationship("Country")
+
+    OrmarCountry = sqlalchemy_to_ormar(Country, metadata=MetaData(), database=database)
+    OrmarCity = OrmarCountry.Meta.model_fields["capital"].to
+    OrmarPerson = OrmarCity.Meta.model_fields["mayor"].to
+
+    assert OrmarPerson.Meta.model_fields["country"].to is OrmarCountry
+    assert OrmarPerson.Meta.table.c.country_id.references(OrmarCountry.Meta.table.c.id)
+    assert OrmarCountry.extract_related_names() == {"capital", "persons"}
+    assert not {Country, City, Person} & set(FORWARD_REF_WAITERS)
+
+
+def test_failed_conversion_does_not_affect_later_conversions():
+    Base = declarative_base()
+
+    class User(Base):
+        __tablename__ = "users"
+        id = Column(Integer, primary_key=True)
+        # not supported by ormar, conversion fails
+        avatar = Column(LargeBinary)
+        best_friend_id = Column(Integer, ForeignKey("users.id"))
+        best_friend = relationship("User", remote_side=[id])
+
+    class Address(Base):
+        __tablename__ = "addresses"
+        id = Column(Integer, primary_key=True)
+        user_id = Column(Integer, ForeignKey("users.id"))
+        user = relationship("User")
+
+    with pytest.raises(TypeError):
+        sqlalchemy_to_ormar(Address, metadata=MetaData(), database=database)
+    assert not {User, Address} & set(CURRENTLY_PROCESSED)
+    assert not {User, Address} & set(PARSED_MODELS)
+    assert not any(User in x for x in FORWARD_REF_WAITERS.values())
+
+    OrmarAddress = sqlalchemy_to_ormar(
+        Address,
+        metadata=MetaData(),
+        database=database,
+        projections={"User": {"exclude": ["avatar"]}},
+    )
+    OrmarUser = OrmarAddress.Meta.model_fields["user"].to
+    assert OrmarUser is PARSED_MODELS[User]
+    assert OrmarUser.Meta.table.name == "users"
+    assert OrmarUser.Meta.model_fields["best_friend"].to is OrmarUser
@@ -0,0 +1,112 @@
+import decimal
+from typing import NamedTuple, Optional
+
+import pytest
+from databases import Database
+from sqlalchemy import (
+    Column,
+    DECIMAL,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    create_engine,
+)
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Session, relationship, sessionmaker
+
+from sqlalchemy_to_ormar import (
+    ormar_model_to_row_type,
+    ormar_row_type_str_repr,
+    records_to_rows,
+    sqlalchemy_to_ormar,
+)
+
+Base = declarative_base()
+Database_URL = "sqlite:///test.db"
+engine = create_engine(Database_URL)
+
+database = Database(Database_URL)
+metadata = MetaData(engine)
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+    salary = Column(DECIMAL)
+
+    addresses = relationship("Address", back_populates="user")
+
+
+class Address(Base):
+    __tablename__ = "addresses"
+    id = Column(Integer, primary_key=True)
+    email_address = Column(String, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"))
+
+    user = relationship("User", back_populates="addresses")
+
+
+@pytest.fixture(autouse=True, scope="module")
+def db_and_sample_data_from_sqlalchemy():
+    Base.metadata.create_all(engine)
+    LocalSession = sessionmaker(bind=engine)
+    db: Session = LocalSession()
+    ed_user = User(name="ed")
+    ed_user.addresses = [
+        Address(email_address="ed@example.com"),
+        Address(email_address="eddy@example.com"),
+    ]
+    db.add(ed_user)
+    db.commit()
+    yield
+    Base.metadata.drop_all(engine)
+
+
+def test_row_type_fields():
+    OrmarAddress = sqlalchemy_to_ormar(Address, database=database, metadata=metadata)
+    OrmarUser = sqlalchemy_to_ormar(User, database=database, metadata=metadata)
+
+    AddressRow = ormar_model_to_row_type(OrmarAddress)
+    UserRow = ormar_model_to_row_type(OrmarUser)
+    assert AddressRow.__name__ == "AddressRow"
+    assert AddressRow._fields == ("id", "email_address", "user")
+    assert AddressRow._columns == ("id", "email_address", "user_id")
+    assert UserRow._fields == ("id", "name", "salary")
+    assert UserRow.__annotations__["salary"] == Optional[decimal.Decimal]
+
+
+def test_row_type_str_repr():
+    OrmarAddress = sqlalchemy_to_ormar(Address, database=database, metadata=metadata)
+    OrmarUser = sqlalchemy_to_ormar(User, database=database, metadata=metadata)
+
+    address_str = ormar_row_type_str_repr(OrmarAddress)
+    user_str = ormar_row_type_str_repr(OrmarUser)
+    assert "class AddressRow(NamedTuple):" in address_str
+    assert "    _columns = ('id', 'email_address', 'user_id')" in address_str
+    assert "    id: int" in address_str
+    assert "    email_address: str" in address_str
+    assert "    user: Optional[int]" in address_str
+    assert "    salary: Optional[decimal.Decimal]" in user_str
+
+    namespace = {"NamedTuple": NamedTuple, "Optional": Optional, "decimal": decimal}
+    exec(address_str, namespace)  # noqa: S102
+    assert namespace["AddressRow"]._columns == ("id", "email_address", "user_id")
+
+
+@pytest.mark.asyncio
+async def test_records_to_rows():
+    OrmarAddress = sqlalchemy_to_ormar(Address, database=database, metadata=metadata)
+    AddressRow = ormar_model_to_row_type(OrmarAddress)
+
+    async with database:
+        records = await database.fetch_all(
+            OrmarAddress.Meta.table.select().order_by(OrmarAddress.Meta.table.c.id)
+        )
+    rows = records_to_rows(AddressRow, records)
+    assert rows == [
+        AddressRow(id=1, email_address="ed@example.com", user=1),
+        AddressRow(id=2, email_address="eddy@example.com", user=1),
+    ]
@@ -0,0 +1,116 @@
+import time
+
+import pytest
+from databases import Database
+from sqlalchemy import (
+    Column,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    create_engine,
+)
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Session, relationship, sessionmaker
+
+from sqlalchemy_to_ormar import prepare, startup
+
+Base = declarative_base()
+Database_URL = "sqlite:///test.db"
+engine = create_engine(Database_URL)
+
+database = Database(Database_URL)
+metadata = MetaData(engine)
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+    addresses = relationship("Address", back_populates="user")
+
+
+class Address(Base):
+    __tablename__ = "addresses"
+    id = Column(Integer, primary_key=True)
+    email_address = Column(String, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"))
+
+    user = relationship("User", back_populates="addresses")
+
+
+@pytest.fixture(autouse=True, scope="module")
+def db_and_sample_data_from_sqlalchemy():
+    Base.metadata.create_all(engine)
+    LocalSession = sessionmaker(bind=engine)
+    db: Session = LocalSession()
+    ed_user = User(name="ed")
+    ed_user.addresses = [Address(email_address="ed@example.com")]
+    db.add(ed_user)
+    db.commit()
+    yield
+    Base.metadata.drop_all(engine)
+
+
+@pytest.mark.asyncio
+async def test_prepare():
+    models = await prepare(
+        Base,
+        database=database,
+        metadata=metadata,
+        warm_connections=2,
+    )
+    try:
+        assert database.is_connected
+        assert set(models) == {"Address", "User"}
+        user = await models["User"].objects.select_related("addresses").get()
+        assert user.name == "ed"
+        assert user.addresses[0].email_address == "ed@example.com"
+    finally:
+        await database.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_prepare_waits_for_conversion_when_connect_fails(monkeypatch):
+    converted = []
+
+    def slow_conversion(base, **kwargs):
+        time.sleep(0.2)
+        converted.append(base)
+        return {}
+
+    async def failing_connect():
+        raise ConnectionError("database is down")
+
+    failing_database = Database(Database_URL)
+    monkeypatch.setattr(startup, "sqlalchemy_base_to_ormar", slow_conversion)
+    monkeypatch.setattr(failing_database, "connect", failing_connect)
+
+    with pytest.raises(ConnectionError):
+        await prepare(Base, database=failing_database, metadata=metadata)
+    assert converted == [Base]
+
+
+@pytest.mark.asyncio
+async def test_prepare_disconnects_when_conversion_fails(monkeypatch):
+    def failing_conversion(base, **kwargs):
+        time.sleep(0.2)
+        raise TypeError("unsupported column")
+
+    own_database = Database(Database_URL)
+    monkeypatch.setattr(startup, "sqlalchemy_base_to_ormar", failing_conversion)
+
+    with pytest.raises(TypeError):
+        await prepare(Base, database=own_database, metadata=metadata)
+    assert not own_database.is_connected
+
+    await database.connect()
+    try:
+        with pytest.raises(TypeError):
+            await prepare(Base, database=database, metadata=metadata)
+        # connected before, so left connected
+        assert database.is_connected
+    finally:
+        await database.disconnect()